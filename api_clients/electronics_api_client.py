@@ -1,14 +1,25 @@
 import os
+import time
+import itertools
+import threading
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from utils.logger import logger
+from utils.resilience import CircuitBreaker, HedgeBudget, LatencyTracker, hedged_call
 
 load_dotenv()
 
 class ElectronicsAPIClient:
     def __init__(self,
                  api_id_env_var="TECHSPECS_API_ID",
-                 api_key_env_var="TECHSPECS_API_KEY"):
+                 api_key_env_var="TECHSPECS_API_KEY",
+                 base_url: str = "https://api.techspecs.io/v5",
+                 timeout: float = 10,
+                 hedge_requests: bool = False,
+                 circuit_breaker: CircuitBreaker = None,
+                 hedge_ratio: float = 0.05,
+                 hedge_max_workers: int = 32):
 
         self.api_id = os.getenv(api_id_env_var)
         self.api_key = os.getenv(api_key_env_var)
@@ -21,41 +32,88 @@ class ElectronicsAPIClient:
             logger.error(f"Missing API key in environment variables: {api_key_env_var}")
             raise ValueError(f"API key environment variable {api_key_env_var} not set.")
         
-        self.base_url = "https://api.techspecs.io/v5"
+        self.base_url = base_url
         self.headers = {
             "accept": "application/json",
             "x-api-id": self.api_id,    # API ID v hlavičce
             "x-api-key": self.api_key   # API klíč v hlavičce
         }
+        self.timeout = timeout
+        self.circuit_breaker = circuit_breaker or CircuitBreaker("techspecs")
+        self.latency_tracker = LatencyTracker()
+        # Hedged duplicates are only sent once there are enough samples for a meaningful p95,
+        # and at most for about hedge_ratio of the calls
+        self.hedge_requests = hedge_requests
+        self.hedge_min_samples = 20
+        self.hedge_budget = HedgeBudget(ratio=hedge_ratio)
+        # Hedged calls run on this pool while it has idle workers (tracked by the slots). Beyond that, calls run
+        # inline on the caller's thread without hedging instead of queueing behind other requests.
+        self._hedge_executor = ThreadPoolExecutor(max_workers=hedge_max_workers, thread_name_prefix="techspecs-hedge") if hedge_requests else None
+        self._hedge_slots = threading.BoundedSemaphore(hedge_max_workers)
         logger.info("ElectronicsAPIClient initialized with TechSpecs API ID and Key.")
 
+    def _get(self, url: str, params: dict = None) -> requests.Response:
+        attempts = itertools.count()
+
+        def call():
+            # Only the first attempt's latency is recorded. A winning duplicate would pull p95 down
+            # and trigger even more hedging.
+            first = next(attempts) == 0
+            started = time.perf_counter()
+            response = requests.get(url, headers=self.headers, params=params, timeout=self.timeout)
+            if first:
+                self.latency_tracker.record(time.perf_counter() - started)
+            return response
+
+        if not self.hedge_requests:
+            return call()
+        self.hedge_budget.record_call()
+        if len(self.latency_tracker) >= self.hedge_min_samples:
+            return hedged_call(call, self.latency_tracker.percentile(95), self._hedge_executor, self.hedge_budget,
+                               self._hedge_slots)
+        return call()
+
     def _make_request(self, endpoint: str, params: dict = None) -> dict:
         
         url = f"{self.base_url}/{endpoint}"
 
+        if not self.circuit_breaker.allow_request():
+            logger.warning(f"Skipping request to {endpoint}: TechSpecs circuit breaker is open.")
+            return {"error": "The API is temporarily unavailable. Please try again later."}
 
         try:
-            response = requests.get(url, headers=self.headers, params=params, timeout=10)
+            response = self._get(url, params)
             response.raise_for_status()
-            return response.json()
+            data = response.json()
+            self.circuit_breaker.record_success()
+            return data
         
         except requests.exceptions.HTTPError as http_err:
+            # Client errors mean the API itself is healthy, only server errors count against the breaker
+            if http_err.response is not None and http_err.response.status_code >= 500:
+                self.circuit_breaker.record_failure()
+            else:
+                self.circuit_breaker.record_success()
             logger.error(f"HTTP error occurred: {http_err} - Response: {response.text}")
             return {"error": f"HTTP error: {http_err.response.status_code} - {http_err.response.text}"}
         
         except requests.exceptions.ConnectionError as conn_err:
+            self.circuit_breaker.record_failure()
             logger.error(f"Connection error occurred: {conn_err}")
             return {"error": "Could not connect to the API. Please check your internet connection."}
         
         except requests.exceptions.Timeout as timeout_err:
+            self.circuit_breaker.record_failure()
             logger.error(f"Timeout error occurred: {timeout_err}")
             return {"error": "The API request timed out."}
         
         except requests.exceptions.RequestException as req_err:
+            self.circuit_breaker.record_failure()
             logger.error(f"An unexpected error occurred during API request: {req_err}")
             return {"error": f"An unexpected error occurred: {req_err}"}
         
         except Exception as e:
+            self.circuit_breaker.record_failure()
             logger.error(f"An unexpected error occurred: {e}")
             return {"error": f"An unexpected error occurred: {e}"}
         
@@ -1,27 +1,97 @@
 import os
+import time
+import threading
 from dotenv import load_dotenv
 from utils.logger import logger
-from openai import OpenAI
+from openai import OpenAI, APIConnectionError, APIStatusError
+from utils.resilience import CircuitBreaker
 
 load_dotenv()
 
+# Returned by get_completion when the LLM API call fails.
+LLM_ERROR_MESSAGE = "Omlouváme se, došlo k chybě při zpracování vašeho požadavku."
+
+
+def _usage_count(usage, *path) -> int:
+    # Usage fields are optional and nested (e.g. prompt_tokens_details.cached_tokens)
+    value = usage
+    for attribute in path:
+        value = getattr(value, attribute, None)
+    return value if isinstance(value, int) else 0
+
+
 class LLMClient:
-    def __init__(self, api_key_env_var="OPENAI_API_KEY"):
+    def __init__(self, api_key_env_var="OPENAI_API_KEY", timeout: float = 30.0, circuit_breaker: CircuitBreaker = None,
+                 base_url: str = None, max_retries: int = 1):
         self.api_key = os.getenv(api_key_env_var)
         if not self.api_key:
             logger.error(f"API key not found for {api_key_env_var}")
             raise ValueError(f"API key environment variable {api_key_env_var} not set.")
-        self.client = OpenAI(api_key=self.api_key)
-        
+        # base_url points the client at an OpenAI-compatible endpoint (e.g. a local stub for load tests)
+        # The SDK retries 408, 429, 5xx and connection errors with backoff (honouring Retry-After). Its default
+        # of 2 retries stretches one call to about 3x timeout, so one retry is kept by default: the worst case
+        # per call is (max_retries + 1) * timeout plus backoff. The breaker only sees the final outcome.
+        self.client = OpenAI(api_key=self.api_key, timeout=timeout, base_url=base_url, max_retries=max_retries)
+        self.circuit_breaker = circuit_breaker or CircuitBreaker("llm")
+        self._usage_lock = threading.Lock()
+        self._usage_stats = {
+            "requests": 0,
+            "prompt_tokens": 0,
+            "cached_tokens": 0,
+            "completion_tokens": 0,
+            "latency_seconds": 0.0
+        }
+
+    def _record_usage(self, model: str, usage, latency: float):
+        prompt_tokens = _usage_count(usage, "prompt_tokens")
+        cached_tokens = _usage_count(usage, "prompt_tokens_details", "cached_tokens")
+        completion_tokens = _usage_count(usage, "completion_tokens")
+        with self._usage_lock:
+            self._usage_stats["requests"] += 1
+            self._usage_stats["prompt_tokens"] += prompt_tokens
+            self._usage_stats["cached_tokens"] += cached_tokens
+            self._usage_stats["completion_tokens"] += completion_tokens
+            self._usage_stats["latency_seconds"] += latency
+        logger.info(f"LLM call to {model} took {latency:.2f}s: prompt_tokens={prompt_tokens}, "
+                    f"cached_tokens={cached_tokens}, completion_tokens={completion_tokens}")
+
+    def get_usage_stats(self) -> dict:
+        """
+        Returns cumulative token usage and latency of successful calls,
+        including the share of prompt tokens served from the provider's prompt cache.
+        """
+        with self._usage_lock:
+            stats = dict(self._usage_stats)
+        stats["cached_token_ratio"] = stats["cached_tokens"] / stats["prompt_tokens"] if stats["prompt_tokens"] else 0.0
+        stats["average_latency_seconds"] = stats["latency_seconds"] / stats["requests"] if stats["requests"] else 0.0
+        return stats
+
+    def get_completion(self, prompt: str, model: str = "gpt-4o-mini", system_prompt: str = "") -> str:
+        messages = [{"role": "user", "content": prompt}]
+        if system_prompt:
+            messages.insert(0, {"role": "system", "content": system_prompt})
+
+        if not self.circuit_breaker.allow_request():
+            logger.warning("Skipping LLM call: LLM circuit breaker is open.")
+            return LLM_ERROR_MESSAGE
 
-    def get_completion(self, prompt: str, model: str = "gpt-4o-mini") -> str:
         try:
+            started = time.perf_counter()
             response = self.client.chat.completions.create(
             model=model,
-            messages=[{"role": "user", "content": prompt}]
+            messages=messages
             )
+            self._record_usage(model, getattr(response, "usage", None), time.perf_counter() - started)
+            self.circuit_breaker.record_success()
             return response.choices[0].message.content
-              
+
         except Exception as e:
+            # Only timeouts, connection errors, rate limiting and server errors that outlasted the retries count
+            # against the breaker. Other client errors (bad request, context length, ...) mean the API is healthy.
+            if isinstance(e, APIConnectionError) or (
+                    isinstance(e, APIStatusError) and (e.status_code >= 500 or e.status_code in (408, 429))):
+                self.circuit_breaker.record_failure()
+            else:
+                self.circuit_breaker.record_success()
             logger.error(f"Error calling LLM API: {e}")
-            return "Omlouváme se, došlo k chybě při zpracování vašeho požadavku."
\ No newline at end of file
+            return LLM_ERROR_MESSAGE
@@ -1,60 +1,123 @@
-from api_clients.llm_client import LLMClient
+from api_clients.llm_client import LLMClient, LLM_ERROR_MESSAGE
 from api_clients.electronics_api_client import ElectronicsAPIClient
 from utils.logger import logger
+from utils.cache import LookupCache
+from data_manager.device_catalog import DeviceRecord, normalize_specs
+from core.ranking import keyword_weights, rank_rows, score_matrix
+from core.prompts import get_prompt_template, SEARCH_PARAMS, RECOMMENDATION, COMPARISON, DEFAULT_MODEL
 import json
-from utils.i18n import get_text
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterable, Iterator
+from utils.i18n import CATALOGS, get_text
+
+# Default cache lifetimes in seconds. A long-lived advisor (one per app process) serves fresh
+# TechSpecs data this long after a lookup; search results change more often than specs.
+SEARCH_CACHE_TTL = 60 * 60
+SPECS_CACHE_TTL = 6 * 60 * 60
+
+# Messages the advisor returns instead of a result when a step fails, in every language.
+_FAILURE_TEXT_KEYS = ("error", "error_llm_parse", "no_devices_found", "error_no_detailed_specs", "error_no_comparison_specs")
+_FAILURE_TEXTS = frozenset([LLM_ERROR_MESSAGE] + [catalog[key] for catalog in CATALOGS.values() for key in _FAILURE_TEXT_KEYS])
+_FALLBACK_PREFIXES = tuple(catalog[key].split("{")[0] for catalog in CATALOGS.values()
+                           for key in ("fallback_recommendation", "fallback_search_order"))
+
+
+def is_failure_result(result: str) -> bool:
+    """
+    True if result is one of the error messages or the local-ranking fallback the advisor
+    returns when an upstream call fails, rather than a real recommendation or comparison.
+    """
+    return not result or result in _FAILURE_TEXTS or result.startswith(_FALLBACK_PREFIXES)
 
     
 class ElectronicsAdvisor:
-    def __init__(self, llm_client: LLMClient, electronics_api_client: ElectronicsAPIClient):
+    def __init__(self, llm_client: LLMClient, electronics_api_client: ElectronicsAPIClient,
+                 search_cache: LookupCache = None, specs_cache: LookupCache = None,
+                 candidate_pool_size: int = 10, top_k: int = 3, model: str = DEFAULT_MODEL,
+                 prefetch_comparisons: bool = False):
         self.llm_client = llm_client
         self.electronics_api_client = electronics_api_client
+        self.model = model
+        # How many search hits are pre-ranked locally, and how many of them go to the LLM
+        self.candidate_pool_size = candidate_pool_size
+        self.top_k = top_k
+        self.search_cache = search_cache if search_cache is not None else LookupCache(ttl=SEARCH_CACHE_TTL)
+        # Holds normalized DeviceRecords rather than the raw spec dicts
+        self.specs_cache = specs_cache if specs_cache is not None else LookupCache(ttl=SPECS_CACHE_TTL)
+        # Seeds by-name searches for the found devices, so comparing them later needs no search calls
+        self.prefetch_comparisons = prefetch_comparisons
         logger.info("ElectronicsAdvisor initialized with LLM and TechSpecs API clients.")
 
-    def _format_specs_for_llm(self, specs: dict) -> str:
-        if not specs:
-            return "No specifications available."
-        
-        formatted_string = f"Device Name: {specs.get('name', 'N/A')}\n"
-        relevant_keys = [
-            "display", "processor", "ram", "storage", "camera", "battery", 
-            "os", "dimensions", "weight", "features"
-        ]
-
-        for key in relevant_keys:
-            if key in specs and specs[key]:
-                value = specs[key]
-                if isinstance(value, dict):
-                    formatted_string += f"- {key.replace('_', ' ').title()}:\n"
-                    for sub_key, sub_value in value.items():
-                        if isinstance(sub_value, (str, int, float, bool)) and sub_value != "":
-                            formatted_string += f"  - {sub_key.replace('_', ' ').title()}: {sub_value}\n"
-                elif isinstance(value, list):
-                    formatted_string += f"- {key.replace('_', ' ').title()}: {', '.join(map(str, value))}\n"
-                else:
-                    if isinstance(value, (str, int, float, bool)) and value != "":
-                        formatted_string += f"- {key.replace('_', ' ').title()}: {value}\n"
-        return formatted_string.strip()
-    
-    def get_personalized_recommendation(self, user_requirements: str, lang: str = "en") -> str:
-        logger.info(f"Generating personalized recommendation for requirements: '{user_requirements}' in lang: '{lang}'")
+    @staticmethod
+    def _search_key(query: str, category: str = "", brand: str = "", limit: int = 5) -> tuple:
+        return (query.strip().casefold(), category, brand, limit)
 
-        category_options = "Smartphones, Tablety, Chytré hodinky, Notebooky, Stolní počítače".replace("Chytré hodinky", "Smartwatches")
+    def _search_devices(self, query: str, category: str = "", brand: str = "", limit: int = 5) -> list[dict]:
+        key = self._search_key(query, category, brand, limit)
+        return self.search_cache.get_or_compute(
+            key,
+            lambda: self.electronics_api_client.search_devices(query=query, category=category, brand=brand, limit=limit))
 
-        prompt_for_search_params = f"""
-        Analyze the user's requirements for an electronic device.
-        Extract the most suitable device category from: {category_options}. If no specific category is mentioned, state "all".
-        Extract any specific brand mentioned (e.g., Apple, Samsung). If no brand, state "any".
-        Identify key keywords/features (e.g., camera quality, battery life, performance, display, storage, portability, budget focus).
-        
-        User requirements: "{user_requirements}"
+    def _get_device_record(self, product_id: str, lang: str = "en") -> DeviceRecord:
+        def fetch():
+            specs = self.electronics_api_client.get_device_specs(product_id, lang=lang)
+            if not specs:
+                return None
+            # In-process: one spec takes tens of microseconds, less than a round trip to a worker process
+            return normalize_specs(specs)
+
+        return self.specs_cache.get_or_compute((product_id, lang), fetch)
+
+    def _get_records_for_devices(self, device_metas: list[dict], lang: str = "en") -> list[DeviceRecord]:
+        if not device_metas:
+            return []
+        with ThreadPoolExecutor(max_workers=min(5, len(device_metas)), thread_name_prefix="advisor-specs") as executor:
+            all_records = list(executor.map(lambda meta: self._get_device_record(meta["id"], lang=lang), device_metas))
 
-        Provide the output in a JSON format:
-        {{"category": "category_name", "brand": "brand_name", "keywords": "comma-separated keywords"}}
-        Example: {{"category": "Smartphones", "brand": "Samsung", "keywords": "great camera, long battery, good display"}}
+        records = []
+        for device_meta, record in zip(device_metas, all_records):
+            if record:
+                records.append(record)
+            else:
+                logger.warning(f"Could not retrieve detailed specs for device ID: {device_meta['id']}")
+        return records
+
+    def seed_comparison_searches(self, device_metas: list[dict]):
+        """
+        Fills the by-name search entries compare_devices reads for the given search results.
+        The device names come from TechSpecs itself, so a by-name search is answered with the
+        known result instead of a new request. Specs need no warming: the recommendation has
+        already cached every record it could fetch.
         """
+        for device_meta in device_metas:
+            search_key = self._search_key(device_meta["name"], limit=1)
+            if search_key not in self.search_cache:
+                self.search_cache.set(search_key, [device_meta])
+
+    def _fallback_recommendation(self, ranked_records: list[DeviceRecord], lang: str = "en",
+                                 spec_based: bool = True) -> str:
+        # Deterministic answer from the local ranking, used when the LLM is unavailable.
+        # Without spec_based the ranking had nothing to compare, so the devices are only listed.
+        names = [record.name for record in ranked_records]
+        if not spec_based:
+            return get_text("fallback_search_order", lang).format(devices=", ".join(names))
+        recommendation = get_text("fallback_recommendation", lang).format(best=names[0])
+        if len(names) > 1:
+            recommendation += " " + get_text("fallback_alternatives", lang).format(others=", ".join(names[1:]))
+        return recommendation
+
+    def get_personalized_recommendation(self, user_requirements: str, lang: str = "en") -> str:
+        logger.info(f"Generating personalized recommendation for requirements: '{user_requirements}' in lang: '{lang}'")
+
+        search_params_template = get_prompt_template(SEARCH_PARAMS, lang, self.model)
+        prompt_for_search_params = search_params_template.render(user_requirements=user_requirements)
 
-        llm_response_params = self.llm_client.get_completion(prompt_for_search_params, model="gpt-4o-mini")
+        llm_response_params = self.llm_client.get_completion(
+            prompt_for_search_params, model=self.model, system_prompt=search_params_template.system)
+        if llm_response_params == LLM_ERROR_MESSAGE:
+            logger.warning("LLM unavailable for search param extraction, searching with the raw requirements.")
+            llm_response_params = json.dumps({"category": "all", "brand": "any", "keywords": user_requirements})
 
         try:
             parsed_params = json.loads(llm_response_params)
@@ -87,86 +150,109 @@ class ElectronicsAdvisor:
             logger.error(f"Unexpected error parsing LLM response: {e}")
             return get_text("error", lang)
         
-        api_search_results = self.electronics_api_client.search_devices(
+        api_search_results = self._search_devices(
             query=keywords_for_search,
             category=category_filter,
             brand=brand_filter,
-            limit=5)
+            limit=self.candidate_pool_size)
         
         if not api_search_results:
             logger.warning(f"No devices found via TechSpecs API for search term: '{keywords_for_search}', category: '{category_filter}', brand: '{brand_filter}'")
             return get_text("no_devices_found", lang)
         
-        detailed_specs_list = []
-        for device_meta in api_search_results[:5]:
-            specs = self.electronics_api_client.get_device_specs(device_meta["id"], lang=lang)
-            if specs:
-                detailed_specs_list.append(specs)
-            else:
-                logger.warning(f"Could not retrieve detailed specs for device ID: {device_meta['id']}")
-        
+        candidate_records = self._get_records_for_devices(api_search_results[:self.candidate_pool_size], lang=lang)
 
-        if not detailed_specs_list:
+        if not candidate_records:
             logger.error("Could not retrieve detailed specifications for any of the found devices.")
             return get_text("error_no_detailed_specs", lang)
-        
 
-        formatted_specs = "\n\n---\n\n".join([self._format_specs_for_llm(s) for s in detailed_specs_list])
+        features = np.vstack([record.features() for record in candidate_records])
+        ranked_records = [candidate_records[row] for row in rank_rows(features, keywords_for_search, top_k=self.top_k)]
 
-        recommendation_prompt = f"""
-        Based on the user's requirements: "{user_requirements}"
-        And the following detailed device specifications:
+        if self.prefetch_comparisons:
+            self.seed_comparison_searches(api_search_results[:self.candidate_pool_size])
 
-        {formatted_specs}
+        formatted_specs = "\n\n---\n\n".join([record.llm_text for record in ranked_records])
 
-        Provide a personalized recommendation for the best electronic device from the listed options.
-        Explain WHY this device fits the user's needs, specifically mentioning how its key features (e.g., display, processor, camera, battery life, design) align with the user's stated priorities.
-        If multiple devices are suitable, recommend the single best one and briefly mention why others might also be considered, focusing on how well they match the *user's specific words and priorities*.
-        Do not mention prices or cost, as this information is not available.
-        Your response should be concise, helpful, and in {lang_to_english_name(lang)}.
-        """
+        recommendation_template = get_prompt_template(RECOMMENDATION, lang, self.model)
+        recommendation_prompt = recommendation_template.render(
+            user_requirements=user_requirements,
+            formatted_specs=formatted_specs)
         logger.info(f"Generating personalized recommendation using LLM with detailed specs for lang: {lang}.")
-        final_recommendation = self.llm_client.get_completion(recommendation_prompt, model="gpt-4o-mini")
+        final_recommendation = self.llm_client.get_completion(
+            recommendation_prompt, model=self.model, system_prompt=recommendation_template.system)
+
+        if not final_recommendation or final_recommendation == LLM_ERROR_MESSAGE:
+            logger.warning("LLM unavailable for the final recommendation, falling back to the local ranking.")
+            # All-zero scores mean no candidate had data for the requested features
+            spec_based = bool(score_matrix(features, keyword_weights(keywords_for_search)).any())
+            return self._fallback_recommendation(ranked_records, lang, spec_based)
 
         return final_recommendation
+
+    def get_personalized_recommendations_batch(self,
+                                               requests: Iterable[tuple[str, str]],
+                                               max_workers: int = 4) -> Iterator[tuple[int, str]]:
+        """
+        Generates recommendations for many (user_requirements, lang) pairs.
+        Identical pairs are computed once, searches and spec fetches are shared
+        through the advisor caches and at most max_workers pipelines run at a time.
+        Yields (index, recommendation) tuples in completion order, where index
+        is the position of the pair in the input.
+        """
+        indexes_by_request = {}
+        for index, (user_requirements, lang) in enumerate(requests):
+            indexes_by_request.setdefault((user_requirements, lang), []).append(index)
+
+        if not indexes_by_request:
+            return
+
+        logger.info(f"Generating batch of {len(indexes_by_request)} unique recommendations with {max_workers} workers.")
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="advisor-batch")
+        try:
+            futures = {
+                executor.submit(self.get_personalized_recommendation, user_requirements, lang): (user_requirements, lang)
+                for user_requirements, lang in indexes_by_request
+            }
+            for future in as_completed(futures):
+                user_requirements, lang = futures[future]
+                try:
+                    recommendation = future.result()
+                except Exception as e:
+                    logger.error(f"Error generating batch recommendation for '{user_requirements}': {e}")
+                    recommendation = get_text("error", lang)
+                for index in indexes_by_request[(user_requirements, lang)]:
+                    yield index, recommendation
+        finally:
+            # If the caller stops consuming early, drop the pipelines that have not started yet
+            # instead of waiting for all of them
+            executor.shutdown(wait=False, cancel_futures=True)
     
     def compare_devices(self, device_names: list[str], user_profile_summary: str = "", lang: str = "en") -> str:
         logger.info(f"Comparing devices: {device_names} with user profile: '{user_profile_summary}' in lang: '{lang}'")
 
-        device_specs_to_compare = []
+        device_records_to_compare = []
         for name in device_names:
-            found = self.electronics_api_client.search_devices(query=name, limit=1, lang=lang)
+            found = self._search_devices(query=name, limit=1)
             if found:
-                specs = self.electronics_api_client.get_device_specs(found[0]["id"], lang=lang)
-                if specs:
-                    device_specs_to_compare.append(specs)
+                record = self._get_device_record(found[0]["id"], lang=lang)
+                if record:
+                    device_records_to_compare.append(record)
                 else:
                     logger.warning(f"Could not retrieve detailed specs for device: {name}")
             else:
                 logger.warning(f"Device '{name}' not found via TechSpecs API search.")
 
-        if not device_specs_to_compare:
+        if not device_records_to_compare:
             return get_text("error_no_comparison_specs", lang)
         
-        formatted_comparison_specs = "\n\n---\n\n".join([self._format_specs_for_llm(s) for s in device_specs_to_compare])
-
-        comparison_prompt = f"""
-        Compare the following electronic devices based on their detailed specifications.
-        User's general preferences/summary: "{user_profile_summary}" (Use this to guide the importance of features).
-        Highlight key differences and similarities that would be relevant to a user making a purchase decision.
-        Organize the comparison clearly, focusing on important features like display, performance, camera, battery, and storage.
-        Provide a summary explaining which device might be better for whom and why, *strictly based on specs and user preferences, not price*.
-        Do not mention prices or cost.
-        Your response should be concise, helpful, and in {lang_to_english_name(lang)}.
-
-        Device specifications to compare:
-        {formatted_comparison_specs}
-        """
+        formatted_comparison_specs = "\n\n---\n\n".join([record.llm_text for record in device_records_to_compare])
+
+        comparison_template = get_prompt_template(COMPARISON, lang, self.model)
+        comparison_prompt = comparison_template.render(
+            user_profile_summary=user_profile_summary,
+            formatted_specs=formatted_comparison_specs)
         logger.info(f"Generating device comparison using LLM with TechSpecs data for lang: {lang}.")
-        comparison_result = self.llm_client.get_completion(comparison_prompt, model="gpt-4o-mini")
+        comparison_result = self.llm_client.get_completion(
+            comparison_prompt, model=self.model, system_prompt=comparison_template.system)
         return comparison_result
-    
-def lang_to_english_name(lang_code: str) -> str:
-    if lang_code == "cs":
-        return "Czech"
-    return "English"
\ No newline at end of file
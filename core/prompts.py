@@ -0,0 +1,138 @@
+from functools import lru_cache
+from string import Template
+from textwrap import dedent
+
+SEARCH_PARAMS = "search_params"
+RECOMMENDATION = "recommendation"
+COMPARISON = "comparison"
+
+DEFAULT_MODEL = "gpt-4o-mini"
+
+# Categories offered to the extraction LLM. The advisor maps the Czech names back to TechSpecs categories.
+CATEGORY_OPTIONS = "Smartphones, Tablety, Smartwatches, Notebooky, Stolní počítače"
+
+# Shared system message, identical for every call so it always forms the start of the stable prefix.
+SYSTEM_PROMPT = """
+    You are an expert consumer electronics advisor.
+    You help users choose electronic devices strictly based on the technical specifications you are given and the user's stated priorities.
+    Never invent specifications. Prices and costs are not available, so never mention them.
+    """
+
+# Template sources use $placeholders so the JSON examples need no brace escaping.
+# Each template is split into static instructions and a per-request payload. The instructions (with
+# $language and $category_options resolved once per compiled template) come first and the variable
+# specs and user text always come last, so identical requests share the longest possible prefix.
+# Note that OpenAI only caches prompts of 1024+ tokens, matched in 128-token blocks from the start.
+# The system message plus instructions are about 220-240 tokens, so different users' requests share
+# no cacheable block and cached_tokens stays 0; only the static part growing past that size would change it.
+_TEMPLATE_SOURCES = {
+    SEARCH_PARAMS: ("""
+        Analyze the user's requirements for an electronic device.
+        Extract the most suitable device category from: $category_options. If no specific category is mentioned, state "all".
+        Extract any specific brand mentioned (e.g., Apple, Samsung). If no brand, state "any".
+        Identify key keywords/features (e.g., camera quality, battery life, performance, RAM, display, storage, portability, budget focus).
+        Write the keywords in English, even if the requirements are in another language.
+
+        Provide the output in a JSON format:
+        {"category": "category_name", "brand": "brand_name", "keywords": "comma-separated keywords"}
+        Example: {"category": "Smartphones", "brand": "Samsung", "keywords": "great camera, long battery, good display"}
+        """, """
+        User requirements: "$user_requirements"
+        """),
+    RECOMMENDATION: ("""
+        Provide a personalized recommendation for the best electronic device from the device specifications listed below.
+        Explain WHY this device fits the user's needs, specifically mentioning how its key features (e.g., display, processor, camera, battery life, design) align with the user's stated priorities.
+        If multiple devices are suitable, recommend the single best one and briefly mention why others might also be considered, focusing on how well they match the *user's specific words and priorities*.
+        Do not mention prices or cost, as this information is not available.
+        Your response should be concise, helpful, and in $language.
+        """, """
+        Detailed device specifications:
+
+        $formatted_specs
+
+        User's requirements: "$user_requirements"
+        """),
+    COMPARISON: ("""
+        Compare the electronic devices listed below based on their detailed specifications.
+        Use the user's general preferences/summary to guide the importance of features.
+        Highlight key differences and similarities that would be relevant to a user making a purchase decision.
+        Organize the comparison clearly, focusing on important features like display, performance, camera, battery, and storage.
+        Provide a summary explaining which device might be better for whom and why, *strictly based on specs and user preferences, not price*.
+        Do not mention prices or cost.
+        Your response should be concise, helpful, and in $language.
+        """, """
+        Device specifications to compare:
+
+        $formatted_specs
+
+        User's general preferences/summary: "$user_profile_summary"
+        """),
+}
+
+# Model specific variants of the sources above, keyed by (template name, model).
+_MODEL_TEMPLATE_SOURCES = {}
+
+
+def lang_to_english_name(lang_code: str) -> str:
+    if lang_code == "cs":
+        return "Czech"
+    return "English"
+
+
+def format_specs_for_llm(specs: dict) -> str:
+    if not specs:
+        return "No specifications available."
+
+    formatted_string = f"Device Name: {specs.get('name', 'N/A')}\n"
+    relevant_keys = [
+        "display", "processor", "ram", "storage", "camera", "battery", 
+        "os", "dimensions", "weight", "features"
+    ]
+
+    for key in relevant_keys:
+        if key in specs and specs[key]:
+            value = specs[key]
+            if isinstance(value, dict):
+                formatted_string += f"- {key.replace('_', ' ').title()}:\n"
+                for sub_key, sub_value in value.items():
+                    if isinstance(sub_value, (str, int, float, bool)) and sub_value != "":
+                        formatted_string += f"  - {sub_key.replace('_', ' ').title()}: {sub_value}\n"
+            elif isinstance(value, list):
+                formatted_string += f"- {key.replace('_', ' ').title()}: {', '.join(map(str, value))}\n"
+            else:
+                if isinstance(value, (str, int, float, bool)) and value != "":
+                    formatted_string += f"- {key.replace('_', ' ').title()}: {value}\n"
+    return formatted_string.strip()
+
+
+class PromptTemplate:
+    """
+    A prompt compiled for one language and model: a static system message and instruction prefix,
+    followed by a payload with only the per-request values left to fill in.
+    """
+    __slots__ = ("name", "lang", "model", "system", "prefix", "payload")
+
+    def __init__(self, name: str, lang: str, model: str, system: str, prefix: str, payload: str):
+        self.name = name
+        self.lang = lang
+        self.model = model
+        self.system = system
+        self.prefix = prefix
+        self.payload = Template(payload)
+
+    @property
+    def text(self) -> str:
+        return f"{self.prefix}\n\n{self.payload.template}"
+
+    def render(self, **values) -> str:
+        """Returns the user message: the stable prefix followed by the filled-in payload."""
+        return f"{self.prefix}\n\n{self.payload.substitute(values)}"
+
+
+@lru_cache(maxsize=None)
+def get_prompt_template(name: str, lang: str = "en", model: str = DEFAULT_MODEL) -> PromptTemplate:
+    instructions, payload = _MODEL_TEMPLATE_SOURCES.get((name, model), _TEMPLATE_SOURCES[name])
+    prefix = Template(dedent(instructions).strip()).safe_substitute(
+        language=lang_to_english_name(lang),
+        category_options=CATEGORY_OPTIONS)
+    return PromptTemplate(name, lang, model, dedent(SYSTEM_PROMPT).strip(), prefix, dedent(payload).strip())
@@ -0,0 +1,175 @@
+import re
+import numpy as np
+from utils.logger import logger
+
+# Numeric spec features used for local pre-ranking, in matrix column order.
+FEATURE_NAMES = ("battery_mah", "ram_gb", "storage_gb", "display_in", "camera_mp", "weight_g")
+
+
+def _sections(*names: str, exclude: tuple = ()) -> re.Pattern:
+    # Whole words only, so "ram" does not match inside "camera". Paths containing
+    # an excluded word never match (e.g. "/memory/internal" is storage, not RAM).
+    pattern = r"(?<![a-z])(?:" + "|".join(names) + r")(?![a-z])"
+    if exclude:
+        pattern = r"^(?!.*(?<![a-z])(?:" + "|".join(exclude) + r")(?![a-z])).*" + pattern
+    return re.compile(pattern)
+
+
+_STORAGE_SECTIONS = ("storage", "internal", "rom", "expandable", "card")
+
+
+# Nominal lithium-ion cell voltage, used to convert battery capacities given in Wh (typical for laptops) to mAh.
+_NOMINAL_CELL_VOLTAGE = 3.85
+
+# Where to look for each feature in the spec dict (matched against the lowercased key path),
+# how to pull the number and unit out of the value, and how to convert each unit to the feature's unit.
+_FEATURE_SOURCES = {
+    "battery_mah": (_sections("battery"), re.compile(r"(\d+(?:\.\d+)?)\s*(mah|wh)\b", re.I),
+                    {"mah": 1.0, "wh": 1000 / _NOMINAL_CELL_VOLTAGE}),
+    "ram_gb": (_sections("ram", "memory", exclude=_STORAGE_SECTIONS), re.compile(r"(\d+(?:\.\d+)?)\s*(gb)", re.I), None),
+    "storage_gb": (_sections(*_STORAGE_SECTIONS), re.compile(r"(\d+(?:\.\d+)?)\s*(gb|tb)", re.I), {"gb": 1.0, "tb": 1024.0}),
+    "display_in": (_sections("display", "screen"), re.compile(r"(\d+(?:\.\d+)?)\s*(?:-?\s*inch|\"|in\b)", re.I), None),
+    "camera_mp": (_sections("camera"), re.compile(r"(\d+(?:\.\d+)?)\s*mp", re.I), None),
+    "weight_g": (_sections("weight"), re.compile(r"(\d+(?:\.\d+)?)\s*(kg|grams?|g|lbs?)\b", re.I),
+                 {"kg": 1000.0, "g": 1.0, "gram": 1.0, "grams": 1.0, "lb": 453.59, "lbs": 453.59}),
+}
+
+# Lower is better for these features (e.g. a lighter device is more portable).
+_LOWER_IS_BETTER = np.array([name == "weight_g" for name in FEATURE_NAMES])
+
+# Keyword fragments mapped to feature weights. Each fragment is a regex matched at the start of a word,
+# so stems cover inflected forms ("portab" -> "portable") without matching inside other words
+# ("light" does not match "flashlight"). The extraction prompt asks for English keywords; the Czech
+# stems cover the raw requirements used as keywords when the extraction LLM is unavailable.
+_KEYWORD_WEIGHTS = {
+    "battery": {"battery_mah": 1.0},
+    "endurance": {"battery_mah": 1.0},
+    "camera": {"camera_mp": 1.0},
+    "photo": {"camera_mp": 1.0},
+    "video": {"camera_mp": 0.5, "storage_gb": 0.5},
+    "performance": {"ram_gb": 1.0},
+    "gaming": {"ram_gb": 1.0, "display_in": 0.5},
+    "fast": {"ram_gb": 0.5},
+    "multitask": {"ram_gb": 1.0},
+    r"ram\b": {"ram_gb": 1.0},
+    "memory": {"ram_gb": 1.0},
+    "storage": {"storage_gb": 1.0},
+    "space": {"storage_gb": 0.5},
+    "display": {"display_in": 1.0},
+    "screen": {"display_in": 1.0},
+    "portab": {"weight_g": 1.0},
+    "light": {"weight_g": 1.0},
+    "compact": {"weight_g": 1.0, "display_in": -0.5},
+    "small": {"weight_g": 0.5, "display_in": -0.5},
+    # Czech
+    "bateri": {"battery_mah": 1.0},
+    "výdrž": {"battery_mah": 1.0},
+    "fotoapar": {"camera_mp": 1.0},
+    "fotk": {"camera_mp": 1.0},
+    "kamer": {"camera_mp": 1.0},
+    "výkon": {"ram_gb": 1.0},
+    "hern": {"ram_gb": 1.0, "display_in": 0.5},
+    "hry": {"ram_gb": 1.0, "display_in": 0.5},
+    "rychl": {"ram_gb": 0.5},
+    "pamě": {"ram_gb": 1.0},
+    "úložišt": {"storage_gb": 1.0},
+    "displej": {"display_in": 1.0},
+    "obrazovk": {"display_in": 1.0},
+    "přenosn": {"weight_g": 1.0},
+    "lehk": {"weight_g": 1.0},
+    "lehč": {"weight_g": 1.0},
+    "kompaktn": {"weight_g": 1.0, "display_in": -0.5},
+    "mal[ýáéí]": {"weight_g": 0.5, "display_in": -0.5},
+}
+_KEYWORD_PATTERNS = [(re.compile(r"(?<!\w)" + fragment), weights) for fragment, weights in _KEYWORD_WEIGHTS.items()]
+
+
+def _flatten(value, path: str = ""):
+    if isinstance(value, dict):
+        for key, sub_value in value.items():
+            yield from _flatten(sub_value, f"{path}/{str(key).lower()}")
+    elif isinstance(value, list):
+        for item in value:
+            yield from _flatten(item, path)
+    elif isinstance(value, (str, int, float)) and not isinstance(value, bool):
+        yield path, str(value)
+
+
+def extract_features(specs: dict) -> np.ndarray:
+    """
+    Extracts the numeric FEATURE_NAMES values from a TechSpecs spec dict.
+    Missing features are NaN.
+    """
+    features = np.full(len(FEATURE_NAMES), np.nan)
+    leaves = list(_flatten(specs))
+    for column, name in enumerate(FEATURE_NAMES):
+        sections, pattern, units = _FEATURE_SOURCES[name]
+        values = []
+        for path, text in leaves:
+            if not sections.search(path):
+                continue
+            for match in pattern.finditer(text):
+                number = float(match.group(1))
+                if units:
+                    number *= units[match.group(2).lower()]
+                values.append(number)
+        if values:
+            # Lightest weight, largest everything else (e.g. main camera over selfie camera)
+            features[column] = min(values) if name == "weight_g" else max(values)
+    return features
+
+
+def keyword_weights(keywords: str) -> np.ndarray:
+    """
+    Builds a feature weight vector from the comma-separated keywords extracted by the LLM.
+    Falls back to equal weights when no keyword maps to a known feature.
+    """
+    weights = np.zeros(len(FEATURE_NAMES))
+    text = (keywords or "").lower()
+    for pattern, feature_weights in _KEYWORD_PATTERNS:
+        if pattern.search(text):
+            for name, weight in feature_weights.items():
+                weights[FEATURE_NAMES.index(name)] += weight
+    if not weights.any():
+        weights[:] = 1.0
+    return weights
+
+
+def feature_bounds(features: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the per-column minimum and maximum, ignoring missing values (inf / -inf for empty columns)."""
+    present = ~np.isnan(features)
+    col_min = np.min(np.where(present, features, np.inf), axis=0, initial=np.inf)
+    col_max = np.max(np.where(present, features, -np.inf), axis=0, initial=-np.inf)
+    return col_min, col_max
+
+
+def score_matrix(features: np.ndarray, weights: np.ndarray, bounds: tuple = None) -> np.ndarray:
+    """
+    Scores each row of an (n_devices, n_features) matrix against the weights.
+    Columns are min-max normalized across the candidates, or across precomputed bounds
+    (see feature_bounds) when scoring a chunk of a larger set; missing values score 0.
+    """
+    if features.shape[0] == 0:
+        return np.zeros(0)
+    present = ~np.isnan(features)
+    col_min, col_max = bounds if bounds is not None else feature_bounds(features)
+    span = col_max - col_min
+    varies = span > 0
+    with np.errstate(invalid="ignore"):
+        normalized = np.where(varies, (features - col_min) / np.where(varies, span, 1.0), 1.0)
+    normalized = np.where(_LOWER_IS_BETTER & varies, 1.0 - normalized, normalized)
+    normalized = np.where(present, normalized, 0.0)
+    return normalized @ weights
+
+
+def rank_rows(features: np.ndarray, keywords: str, top_k: int = 3) -> np.ndarray:
+    """
+    Returns the indexes of the top_k rows of the feature matrix, best first, scored against the keywords.
+    Ties keep the original row order, so the result is deterministic.
+    """
+    scores = score_matrix(features, keyword_weights(keywords))
+    order = np.argsort(-scores, kind="stable")[:top_k]
+    logger.info(f"Pre-ranked {features.shape[0]} candidates, keeping top {len(order)} with scores "
+                f"{[round(float(scores[i]), 3) for i in order]}")
+    return order
+
@@ -0,0 +1,96 @@
+import os
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from core.ranking import feature_bounds, keyword_weights, score_matrix
+from data_manager.device_catalog import DeviceCatalog, DeviceRecord, normalize_specs
+from utils.logger import logger
+
+# Catalog memory-mapped by each worker process in _init_worker.
+_worker_catalog = None
+
+
+def _init_worker(catalog_path: str):
+    global _worker_catalog
+    if catalog_path:
+        _worker_catalog = DeviceCatalog.load(catalog_path, mmap=True)
+
+
+def _normalize_chunk(specs_chunk: list[dict]) -> list[DeviceRecord]:
+    return [normalize_specs(specs) for specs in specs_chunk]
+
+
+def _rank_chunk(rows: np.ndarray, weights: np.ndarray, bounds: tuple, top_k: int) -> tuple[np.ndarray, np.ndarray]:
+    # Scores rows of the shared catalog; only row indexes and the best scores cross the process boundary
+    scores = score_matrix(_worker_catalog.features[rows], weights, bounds)
+    order = np.argsort(-scores, kind="stable")[:top_k]
+    return rows[order], scores[order]
+
+
+class CPUWorkerPool:
+    """
+    Process pool for bulk CPU work (normalizing large spec dumps, catalog-wide scoring),
+    so it scales across cores instead of sharing one GIL.
+    Workers memory-map the same saved DeviceCatalog read-only, so scoring tasks send row
+    indexes instead of pickled specs. Not meant for per-request work: a single spec normalizes
+    faster in-process than it can be pickled to a worker and back.
+    """
+
+    def __init__(self, catalog=None, max_workers: int = None):
+        """
+        catalog is a saved DeviceCatalog directory or an in-memory DeviceCatalog
+        (which is saved to a temporary directory first). It is only needed for rank_catalog.
+        """
+        self._temp_dir = None
+        if isinstance(catalog, DeviceCatalog):
+            self._temp_dir = tempfile.TemporaryDirectory(prefix="device_catalog_")
+            catalog.save(self._temp_dir.name)
+            catalog = self._temp_dir.name
+        self.catalog_path = catalog
+        self.catalog = DeviceCatalog.load(catalog, mmap=True) if catalog else None
+        self.max_workers = max_workers or os.cpu_count() or 1
+        # spawn, because forking a process that already runs Streamlit or request threads is unsafe
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.catalog_path,))
+        logger.info(f"CPUWorkerPool started with {self.max_workers} worker processes (catalog: {self.catalog_path}).")
+
+    def normalize_specs(self, specs_list: list[dict], chunk_size: int = 32) -> list[DeviceRecord]:
+        """
+        Normalizes raw spec dicts into DeviceRecords in the worker processes, keeping the input order.
+        Only worth it for thousands of specs (e.g. building a DeviceCatalog) on multiple cores.
+        """
+        chunks = [specs_list[i:i + chunk_size] for i in range(0, len(specs_list), chunk_size)]
+        return [record for chunk in self._executor.map(_normalize_chunk, chunks) for record in chunk]
+
+    def rank_catalog(self, keywords: str, top_k: int = 3, brand: str = "", category: str = "", os_name: str = "") -> np.ndarray:
+        """
+        Returns the top_k catalog rows for the keywords among devices matching the filters.
+        Same result as DeviceCatalog.rank, with the scoring split across the workers.
+        """
+        if self.catalog is None:
+            raise ValueError("CPUWorkerPool was created without a device catalog.")
+        rows = self.catalog.filter(brand=brand, category=category, os_name=os_name)
+        if len(rows) == 0:
+            return rows
+        # Normalize against the whole filtered set, so chunk scores are comparable
+        bounds = feature_bounds(self.catalog.features[rows])
+        weights = keyword_weights(keywords)
+        futures = [self._executor.submit(_rank_chunk, chunk, weights, bounds, top_k)
+                   for chunk in np.array_split(rows, min(self.max_workers, len(rows)))]
+
+        results = [future.result() for future in futures]
+        best_rows = np.concatenate([chunk_rows for chunk_rows, _ in results])
+        best_scores = np.concatenate([chunk_scores for _, chunk_scores in results])
+        # Highest score first, ties in catalog order like DeviceCatalog.rank
+        order = np.lexsort((best_rows, -best_scores))[:top_k]
+        return best_rows[order]
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+        if self._temp_dir:
+            self.catalog = None
+            self._temp_dir.cleanup()
@@ -1,20 +1,43 @@
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from utils.logger import logger
 
 DATABASE_NAME = "personal_shopper.db"
 
 class DatabaseManager:
-    def __init__(self):
+    def __init__(self, database_name: str = DATABASE_NAME):
+        self.database_name = database_name
         self.conn = None
+        # One connection is shared by all Streamlit sessions, so access is serialized
+        self._lock = threading.Lock()
+        self._lock_stats = {"acquisitions": 0, "wait_seconds": 0.0, "max_wait_seconds": 0.0}
+
+    @contextmanager
+    def _locked(self):
+        started = time.perf_counter()
+        with self._lock:
+            waited = time.perf_counter() - started
+            self._lock_stats["acquisitions"] += 1
+            self._lock_stats["wait_seconds"] += waited
+            self._lock_stats["max_wait_seconds"] = max(self._lock_stats["max_wait_seconds"], waited)
+            yield
+
+    def get_lock_stats(self) -> dict:
+        """Returns how often the connection lock was taken and how long callers waited for it."""
+        with self._lock:
+            return dict(self._lock_stats)
 
     def connect(self):
         try:
-            self.conn = sqlite3.connect(DATABASE_NAME)
+            self.conn = sqlite3.connect(self.database_name, check_same_thread=False)
             self.conn.row_factory = sqlite3.Row
-            logger.info(f"Connected to {DATABASE_NAME}")
+            logger.info(f"Connected to {self.database_name}")
         except sqlite3.Error as e:
             logger.error(f"Error connecting to database: {e}")
             raise
+        self._create_tables()
 
     def disconnect(self):
         if self.conn:
@@ -22,28 +45,31 @@ class DatabaseManager:
             logger.info(f"Disconnected from database.")
 
     def _create_tables(self):
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS user_profiles (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id TEXT UNIQUE,
-                preferences TEXT, -- JSON string for preferences
-                history TEXT    -- JSON string for search history
-            )
-        """)
-        self.conn.commit()
+        with self._locked():
+            cursor = self.conn.cursor()
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS user_profiles (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id TEXT UNIQUE,
+                    preferences TEXT, -- JSON string for preferences
+                    history TEXT    -- JSON string for search history
+                )
+            """)
+            self.conn.commit()
         logger.info("Database tables checked/created.")
-    
+
     def save_user_profile(self, user_id, preferences, history):
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            INSERT OR REPLACE INTO user_profiles (user_id, preferences, history)
-            VALUES (?, ?, ?)
-        """, (user_id, preferences, history))
-        self.conn.commit()
+        with self._locked():
+            cursor = self.conn.cursor()
+            cursor.execute("""
+                INSERT OR REPLACE INTO user_profiles (user_id, preferences, history)
+                VALUES (?, ?, ?)
+            """, (user_id, preferences, history))
+            self.conn.commit()
         logger.info(f"Saved profile for user: {user_id}")
 
     def get_user_profile(self, user_id):
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT * FROM user_profiles WHERE user_id = ?", (user_id,))
-        return cursor.fetchone()
\ No newline at end of file
+        with self._locked():
+            cursor = self.conn.cursor()
+            cursor.execute("SELECT * FROM user_profiles WHERE user_id = ?", (user_id,))
+            return cursor.fetchone()
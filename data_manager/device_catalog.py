@@ -0,0 +1,189 @@
+import os
+import sys
+import json
+from dataclasses import dataclass
+import numpy as np
+from core.prompts import format_specs_for_llm
+from core.ranking import FEATURE_NAMES, extract_features, rank_rows
+from utils.logger import logger
+
+CATEGORICAL_COLUMNS = ("brand", "category", "os")
+STRING_COLUMNS = ("id", "name", "llm_text")
+
+
+def _find_text(specs, key: str) -> str:
+    # First string value stored under key (case-insensitive) anywhere in the nested spec dict
+    if isinstance(specs, dict):
+        for sub_key, value in specs.items():
+            if str(sub_key).lower() == key and isinstance(value, str):
+                return value.strip()
+        for value in specs.values():
+            if isinstance(value, dict):
+                found = _find_text(value, key)
+                if found:
+                    return found
+    return ""
+
+
+@dataclass
+class DeviceRecord:
+    """
+    Normalized, typed device specs. Holds only what ranking, filtering and the LLM
+    prompts need, so it is much smaller than the raw TechSpecs response.
+    """
+    __slots__ = ("id", "name", "brand", "category", "os", *FEATURE_NAMES, "llm_text")
+
+    id: str
+    name: str
+    brand: str
+    category: str
+    os: str
+    battery_mah: float
+    ram_gb: float
+    storage_gb: float
+    display_in: float
+    camera_mp: float
+    weight_g: float
+    llm_text: str
+
+    @classmethod
+    def from_specs(cls, specs: dict, llm_text: str = "") -> "DeviceRecord":
+        """
+        Builds a record from a get_device_specs response.
+        llm_text is the pre-formatted spec text used in LLM prompts.
+        """
+        features = extract_features(specs)
+        return cls(
+            str(specs.get("id", "")),
+            str(specs.get("name", "N/A")),
+            sys.intern(_find_text(specs, "brand")),
+            sys.intern(_find_text(specs, "category")),
+            sys.intern(_find_text(specs, "os")),
+            *(float(value) for value in features),
+            llm_text,
+        )
+
+    def features(self) -> np.ndarray:
+        return np.array([getattr(self, name) for name in FEATURE_NAMES])
+
+
+def normalize_specs(specs: dict) -> DeviceRecord:
+    """Parses and formats a raw spec dict once, producing the record the advisor caches and ranks."""
+    return DeviceRecord.from_specs(specs, llm_text=format_specs_for_llm(specs))
+
+
+class DeviceCatalog:
+    """
+    Column-oriented table of DeviceRecords.
+    Numeric features live in one Fortran-ordered float matrix (each feature column is contiguous),
+    brand/category/os are interned into int32 codes and free text is packed into UTF-8 blobs.
+    A saved catalog can be loaded memory-mapped, so processes share the pages instead of
+    each holding its own copy.
+    """
+
+    def __init__(self, features: np.ndarray, codes: dict, vocabularies: dict, strings: dict):
+        self.features = features
+        self.codes = codes
+        self.vocabularies = vocabularies
+        self.strings = strings
+        self._row_by_id = None
+
+    @classmethod
+    def from_records(cls, records: list[DeviceRecord]) -> "DeviceCatalog":
+        features = np.asfortranarray(
+            np.array([[getattr(r, name) for name in FEATURE_NAMES] for r in records], dtype=np.float64)
+            .reshape(len(records), len(FEATURE_NAMES)))
+
+        codes = {}
+        vocabularies = {}
+        for column in CATEGORICAL_COLUMNS:
+            vocabulary = {}
+            codes[column] = np.array(
+                [vocabulary.setdefault(getattr(r, column), len(vocabulary)) for r in records], dtype=np.int32)
+            vocabularies[column] = list(vocabulary)
+
+        strings = {}
+        for column in STRING_COLUMNS:
+            encoded = [getattr(r, column).encode("utf-8") for r in records]
+            offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+            offsets[1:] = np.cumsum([len(e) for e in encoded])
+            data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+            strings[column] = (offsets, data)
+
+        return cls(features, codes, vocabularies, strings)
+
+    def __len__(self) -> int:
+        return self.features.shape[0]
+
+    def column(self, name: str) -> np.ndarray:
+        return self.features[:, FEATURE_NAMES.index(name)]
+
+    def string_at(self, column: str, row: int) -> str:
+        offsets, data = self.strings[column]
+        return bytes(data[offsets[row]:offsets[row + 1]]).decode("utf-8")
+
+    def categorical_at(self, column: str, row: int) -> str:
+        return self.vocabularies[column][self.codes[column][row]]
+
+    def record(self, row: int) -> DeviceRecord:
+        return DeviceRecord(
+            self.string_at("id", row),
+            self.string_at("name", row),
+            *(sys.intern(self.categorical_at(column, row)) for column in CATEGORICAL_COLUMNS),
+            *(float(value) for value in self.features[row]),
+            self.string_at("llm_text", row),
+        )
+
+    def index_of(self, device_id: str) -> int:
+        """Returns the row of device_id, or -1 if it is not in the catalog."""
+        if self._row_by_id is None:
+            self._row_by_id = {self.string_at("id", row): row for row in range(len(self))}
+        return self._row_by_id.get(device_id, -1)
+
+    def filter(self, brand: str = "", category: str = "", os_name: str = "") -> np.ndarray:
+        """Returns the rows matching all given (case-insensitive) brand/category/os values."""
+        mask = np.ones(len(self), dtype=bool)
+        for column, wanted in (("brand", brand), ("category", category), ("os", os_name)):
+            if wanted:
+                matching = [code for code, value in enumerate(self.vocabularies[column])
+                            if value.lower() == wanted.lower()]
+                mask &= np.isin(self.codes[column], matching)
+        return np.flatnonzero(mask)
+
+    def rank(self, keywords: str, top_k: int = 3, rows: np.ndarray = None) -> np.ndarray:
+        """Returns up to top_k rows (of rows, or of the whole catalog) best first for the keywords."""
+        rows = np.arange(len(self)) if rows is None else np.asarray(rows)
+        return rows[rank_rows(self.features[rows], keywords, top_k)]
+
+    def save(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, "features.npy"), self.features)
+        for column in CATEGORICAL_COLUMNS:
+            np.save(os.path.join(directory, f"{column}_codes.npy"), self.codes[column])
+        for column in STRING_COLUMNS:
+            offsets, data = self.strings[column]
+            np.save(os.path.join(directory, f"{column}_offsets.npy"), offsets)
+            np.save(os.path.join(directory, f"{column}_data.npy"), data)
+        with open(os.path.join(directory, "vocabularies.json"), "w", encoding="utf-8") as f:
+            json.dump({"feature_names": FEATURE_NAMES, **self.vocabularies}, f, ensure_ascii=False)
+        logger.info(f"Saved device catalog with {len(self)} devices to {directory}")
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> "DeviceCatalog":
+        mmap_mode = "r" if mmap else None
+
+        def load_array(filename):
+            return np.load(os.path.join(directory, filename), mmap_mode=mmap_mode)
+
+        with open(os.path.join(directory, "vocabularies.json"), encoding="utf-8") as f:
+            stored = json.load(f)
+        if tuple(stored.pop("feature_names")) != FEATURE_NAMES:
+            raise ValueError(f"Device catalog in {directory} was built with different features.")
+
+        vocabularies = {column: [sys.intern(v) for v in stored[column]] for column in CATEGORICAL_COLUMNS}
+        codes = {column: load_array(f"{column}_codes.npy") for column in CATEGORICAL_COLUMNS}
+        strings = {column: (load_array(f"{column}_offsets.npy"), load_array(f"{column}_data.npy"))
+                   for column in STRING_COLUMNS}
+        catalog = cls(load_array("features.npy"), codes, vocabularies, strings)
+        logger.info(f"Loaded device catalog with {len(catalog)} devices from {directory} (mmap={mmap})")
+        return catalog
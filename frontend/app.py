@@ -8,9 +8,9 @@ import json
 
 from api_clients.llm_client import LLMClient
 from api_clients.electronics_api_client import ElectronicsAPIClient
-from core.advisor import ElectronicsAdvisor
+from core.advisor import ElectronicsAdvisor, is_failure_result
 from data_manager.database import DatabaseManager
-from utils.i18n import get_text
+from utils.i18n import get_catalog
 from utils.logger import logger
 
 
@@ -39,14 +39,24 @@ def get_database_manager():
     return db_manager
 
 
-llm_client_instance = get_llm_client()
-electronics_api_client_instance = get_electronics_api_client()
+@st.cache_resource
+def get_advisor():
+    # Shared across reruns and sessions so its caches persist.
+    # The caches are bounded (LRU) and expire entries (SEARCH_CACHE_TTL / SPECS_CACHE_TTL in core/advisor.py).
+    return ElectronicsAdvisor(get_llm_client(), get_electronics_api_client(), prefetch_comparisons=True)
+
+
 db_manager_instance = get_database_manager()
-advisor_instance = ElectronicsAdvisor(llm_client_instance, electronics_api_client_instance)
+advisor_instance = get_advisor()
 
 
-def run_app():
+# Per-session results are keyed by their inputs, so reruns (including language switches) only re-render them.
+MAX_MEMOIZED_RESULTS = 20
+
+LANG_OPTIONS = {"English": "en", "Čeština": "cs"}
+
 
+def init_session_state():
     if 'lang' not in st.session_state:
         st.session_state.lang = "en"
     if 'current_user_id' not in st.session_state:
@@ -55,123 +65,191 @@ def run_app():
         st.session_state.requirements_input = ""
     if 'compare_input' not in st.session_state:
         st.session_state.compare_input = ""
+    if 'results' not in st.session_state:
+        st.session_state.results = {}
+    if 'failed_results' not in st.session_state:
+        st.session_state.failed_results = {}
+    if 'last_recommendation_key' not in st.session_state:
+        st.session_state.last_recommendation_key = None
+    if 'last_comparison_key' not in st.session_state:
+        st.session_state.last_comparison_key = None
+
+
+def memoized_result(key: tuple, compute):
+    results = st.session_state.results
+    if key in results:
+        return results[key]
+    result = compute()
+    # Error and fallback messages are shown, but not memoized, so the next click retries the upstream calls
+    failed = is_failure_result(result)
+    store = st.session_state.failed_results if failed else results
+    st.session_state.failed_results.pop(key, None)
+    store[key] = result
+    while len(store) > MAX_MEMOIZED_RESULTS:
+        store.pop(next(iter(store)))
+    return result
+
+
+def displayed_result(key: tuple):
+    if key in st.session_state.results:
+        return st.session_state.results[key]
+    return st.session_state.failed_results.get(key)
+
+
+def get_user_profile_summary() -> str:
+    if st.session_state.current_user_id:
+        profile = db_manager_instance.get_user_profile(st.session_state.current_user_id)
+        if profile and profile['preferences']:
+            return json.loads(profile['preferences']).get("requirements_input", "")
+    return ""
+
+
+@st.fragment
+def profile_section(texts):
+    st.text_input(
+        texts["user_id_label"],
+        value=st.session_state.current_user_id,
+        key="user_id_input_sidebar"
+    )
 
-    with st.sidebar:
-        st.title(get_text("select_language", st.session_state.lang))
-        lang_options = {"English": "en", "Čeština": "cs"}
-        selected_lang_name = st.radio(
-            "",
-            list(lang_options.keys()),
-            index=list(lang_options.values()).index(st.session_state.lang)
-        )
-        st.session_state.lang = lang_options[selected_lang_name]
-
-        st.markdown("---")
-
-        st.text_input(
-            get_text("user_id_label", st.session_state.lang),
-            value=st.session_state.current_user_id,
-            key="user_id_input_sidebar"
-        )
-
-        st.session_state.current_user_id = st.session_state.user_id_input_sidebar
-
-        col1, col2 = st.columns(2)
-        with col1:
-            if st.button(get_text("save_profile", st.session_state.lang)):
-                if st.session_state.current_user_id:
-                    current_preferences = {
-                        "requirements_input": st.session_state.get("requirements_input", ""),
-                        "compare_input": st.session_state.get("compare_input", ""),
-                    }
-                    db_manager_instance.save_user_profile(
-                        st.session_state.current_user_id,
-                        json.dumps(current_preferences),
-                        json.dumps([])
-                    )
-                    st.success(get_text("profile_saved", st.session_state.lang))
-                else:
-                    st.warning(get_text("no_user_id_warning", st.session_state.lang))
-
-        with col2:
-            if st.button(get_text("load_profile", st.session_state.lang)):
-                if st.session_state.current_user_id:
-                    profile = db_manager_instance.get_user_profile(st.session_state.current_user_id)
-                    if profile:
-                        loaded_prefs = json.loads(profile["preferences"])
-                        st.session_state.requirements_input = loaded_prefs.get("requirements_input", "")
-                        st.session_state.compare_input = loaded_prefs.get("compare_input", "")
-                        st.success(get_text("profile_loaded", st.session_state.lang))
-                    else:
-                        st.info(get_text("no_profile_found", st.session_state.lang))
+    st.session_state.current_user_id = st.session_state.user_id_input_sidebar
+
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button(texts["save_profile"]):
+            if st.session_state.current_user_id:
+                current_preferences = {
+                    "requirements_input": st.session_state.get("requirements_input", ""),
+                    "compare_input": st.session_state.get("compare_input", ""),
+                }
+                db_manager_instance.save_user_profile(
+                    st.session_state.current_user_id,
+                    json.dumps(current_preferences),
+                    json.dumps([])
+                )
+                st.success(texts["profile_saved"])
+            else:
+                st.warning(texts["no_user_id_warning"])
+
+    with col2:
+        if st.button(texts["load_profile"]):
+            if st.session_state.current_user_id:
+                profile = db_manager_instance.get_user_profile(st.session_state.current_user_id)
+                if profile:
+                    loaded_prefs = json.loads(profile["preferences"])
+                    st.session_state.requirements_input = loaded_prefs.get("requirements_input", "")
+                    st.session_state.compare_input = loaded_prefs.get("compare_input", "")
+                    st.session_state.profile_message = "profile_loaded"
+                    # The loaded inputs live in the other sections, so the whole page has to rerun
+                    st.rerun(scope="app")
                 else:
-                    st.warning(get_text("no_user_id_warning", st.session_state.lang))
+                    st.info(texts["no_profile"])
+            else:
+                st.warning(texts["no_user_id_warning"])
 
-    st.title(get_text("welcome_title", st.session_state.lang))
-    st.markdown("---")
+    if st.session_state.get("profile_message"):
+        st.success(texts[st.session_state.pop("profile_message")])
 
 
-    st.header(get_text("get_recommendation", st.session_state.lang))
+@st.fragment
+def recommendation_section(texts):
+    st.header(texts["get_recommendation"])
     user_requirements = st.text_area(
-        get_text("enter_requirements", st.session_state.lang),
+        texts["enter_requirements"],
         height=100,
         key="requirements_input"
     )
 
-    if st.button(get_text("get_recommendation_button", st.session_state.lang), key="recommend_button"):
+    if st.button(texts["get_recommendation_button"], key="recommend_button"):
         if user_requirements:
-            with st.spinner(get_text("loading", st.session_state.lang)):
+            key = ("recommendation", user_requirements, st.session_state.lang)
+            with st.spinner(texts["loading"]):
                 try:
-                    recommendation = advisor_instance.get_personalized_recommendation(
+                    memoized_result(key, lambda: advisor_instance.get_personalized_recommendation(
                         user_requirements,
                         lang=st.session_state.lang
-                    )
-                    st.subheader(get_text("recommendation_for_you", st.session_state.lang))
-                    st.write(recommendation)
+                    ))
+                    st.session_state.last_recommendation_key = key
                 except Exception as e:
                     logger.error(f"Error getting recommendation: {e}")
-                    st.error(get_text("error", st.session_state.lang))
+                    st.error(texts["error"])
         else:
-            st.warning(get_text("enter_requirements_warning", st.session_state.lang))
+            st.warning(texts["enter_requirements_warning"])
 
-    st.markdown("---")
+    recommendation = displayed_result(st.session_state.last_recommendation_key)
+    if recommendation is not None:
+        st.subheader(texts["recommendation_for_you"])
+        st.write(recommendation)
 
-    st.header(get_text("compare_devices", st.session_state.lang))
+
+@st.fragment
+def comparison_section(texts):
+    st.header(texts["compare_devices"])
     device_names_input = st.text_input(
-        get_text("enter_device_names", st.session_state.lang),
+        texts["enter_device_names"],
         key="compare_input"
     )
 
-    if st.button(get_text("compare", st.session_state.lang), key="compare_button"):
-        if device_names_input:
-            device_list = [name.strip() for name in device_names_input.split(',') if name.strip()]
-            if device_list:
-                with st.spinner(get_text("loading", st.session_state.lang)):
-                    try:
-                        user_profile_summary = ""
-                        if st.session_state.current_user_id:
-                            profile = db_manager_instance.get_user_profile(st.session_state.current_user_id)
-                            if profile and profile['preferences']:
-                                user_profile_summary = json.loads(profile['preferences']).get("requirements_input", "")
-                        
-                        comparison = advisor_instance.compare_devices(
-                            device_list,
-                            user_profile_summary,
-                            lang=st.session_state.lang
-                        )
-                        st.subheader(get_text("comparison_result", st.session_state.lang))
-                        st.write(comparison)
-                    except Exception as e:
-                        logger.error(f"Error comparing devices: {e}")
-                        st.error(get_text("error", st.session_state.lang))
-            else:
-                st.warning(get_text("enter_device_names_warning", st.session_state.lang))
+    if st.button(texts["compare"], key="compare_button"):
+        device_list = [name.strip() for name in device_names_input.split(',') if name.strip()]
+        if device_list:
+            with st.spinner(texts["loading"]):
+                try:
+                    user_profile_summary = get_user_profile_summary()
+                    key = ("comparison", tuple(device_list), user_profile_summary, st.session_state.lang)
+                    memoized_result(key, lambda: advisor_instance.compare_devices(
+                        device_list,
+                        user_profile_summary,
+                        lang=st.session_state.lang
+                    ))
+                    st.session_state.last_comparison_key = key
+                except Exception as e:
+                    logger.error(f"Error comparing devices: {e}")
+                    st.error(texts["error"])
         else:
-            st.warning(get_text("enter_device_names_warning", st.session_state.lang))
+            st.warning(texts["enter_device_names_warning"])
+
+    comparison = displayed_result(st.session_state.last_comparison_key)
+    if comparison is not None:
+        st.subheader(texts["comparison_result"])
+        st.write(comparison)
+
+
+def on_language_change():
+    st.session_state.lang = LANG_OPTIONS[st.session_state.lang_name]
+
+
+def run_app():
+    init_session_state()
+    # Changing the language reruns the page, but every result is already in session state
+    texts = get_catalog(st.session_state.lang)
+
+    with st.sidebar:
+        st.title(texts["select_language"])
+        st.radio(
+            texts["select_language"],
+            list(LANG_OPTIONS.keys()),
+            index=list(LANG_OPTIONS.values()).index(st.session_state.lang),
+            key="lang_name",
+            on_change=on_language_change,
+            label_visibility="collapsed"
+        )
+
+        st.markdown("---")
+        profile_section(texts)
+
+    st.title(texts["welcome_title"])
+    st.markdown("---")
+
+    recommendation_section(texts)
+
+    st.markdown("---")
+
+    comparison_section(texts)
 
     st.markdown("---")
 
-    st.subheader(get_text("future_work_title", st.session_state.lang))
-    st.write(get_text("future_work_description", st.session_state.lang))
+    st.subheader(texts["future_work_title"])
+    st.write(texts["future_work_desc"])
 
 run_app()
\ No newline at end of file
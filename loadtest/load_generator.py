@@ -0,0 +1,316 @@
+"""
+Load generator for one app process.
+
+Simulates N concurrent Streamlit sessions running the same code paths as frontend/app.py
+(profile save/load through DatabaseManager, recommend and compare through ElectronicsAdvisor)
+against local stub upstreams, and reports throughput, latency percentiles, DB lock
+contention and memory growth.
+
+Usage:
+    python -m loadtest.load_generator --sessions 20 --duration 60
+"""
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import json
+import random
+import tempfile
+import threading
+import time
+import tracemalloc
+from contextlib import ExitStack, contextmanager
+from collections import defaultdict
+import numpy as np
+
+from api_clients.llm_client import LLMClient
+from api_clients.electronics_api_client import ElectronicsAPIClient
+from core.advisor import ElectronicsAdvisor, is_failure_result
+from data_manager.database import DatabaseManager
+from loadtest.stub_upstreams import StubUpstreams
+from utils.logger import logger
+
+REQUIREMENTS = [
+    "I need a phone with a great camera for travel and long battery life",
+    "Lightweight phone with a good display",
+    "Fast phone for gaming with lots of storage",
+    "Cheap reliable phone for my parents",
+    "Compact phone with a good camera",
+    "Phone with the biggest battery",
+]
+
+# Relative frequency of the user actions a session performs.
+ACTIONS = {
+    "load_profile": 2,
+    "save_profile": 1,
+    "recommend": 4,
+    "compare": 3,
+}
+
+
+def _rss_mb() -> float:
+    # Current resident set size on Linux, peak RSS elsewhere
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except (OSError, ValueError, AttributeError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+class Session:
+    """One simulated user session, performing the app's actions until stop is set."""
+
+    def __init__(self, session_id: int, advisor: ElectronicsAdvisor, db_manager: DatabaseManager,
+                 stub: StubUpstreams, think_time: float, seed: int):
+        self.user_id = f"loadtest_user_{session_id}"
+        self.advisor = advisor
+        self.db_manager = db_manager
+        self.stub = stub
+        self.think_time = think_time
+        self.rng = random.Random(seed)
+        self.lang = self.rng.choice(["en", "cs"])
+        self.requirements_input = self.rng.choice(REQUIREMENTS)
+        self.compare_input = ""
+
+    def _user_profile_summary(self) -> str:
+        profile = self.db_manager.get_user_profile(self.user_id)
+        if profile and profile["preferences"]:
+            return json.loads(profile["preferences"]).get("requirements_input", "")
+        return ""
+
+    def load_profile(self):
+        profile = self.db_manager.get_user_profile(self.user_id)
+        if profile:
+            loaded_prefs = json.loads(profile["preferences"])
+            self.requirements_input = loaded_prefs.get("requirements_input", "")
+            self.compare_input = loaded_prefs.get("compare_input", "")
+
+    def save_profile(self):
+        current_preferences = {"requirements_input": self.requirements_input, "compare_input": self.compare_input}
+        self.db_manager.save_user_profile(self.user_id, json.dumps(current_preferences), json.dumps([]))
+
+    def recommend(self):
+        self.requirements_input = self.rng.choice(REQUIREMENTS)
+        recommendation = self.advisor.get_personalized_recommendation(self.requirements_input, lang=self.lang)
+        # Users tend to compare devices from the page they were just recommended
+        candidates = [p["name"] for p in self.stub.search(self.requirements_input, 3)["products"]]
+        self.compare_input = ", ".join(self.rng.sample(candidates, 2))
+        return recommendation
+
+    def compare(self):
+        if not self.compare_input:
+            self.compare_input = ", ".join(self.rng.sample([d["name"] for d in self.stub.devices.values()], 2))
+        device_list = [name.strip() for name in self.compare_input.split(",") if name.strip()]
+        return self.advisor.compare_devices(device_list, self._user_profile_summary(), lang=self.lang)
+
+    def run(self, stop: threading.Event, record):
+        actions = list(ACTIONS)
+        weights = list(ACTIONS.values())
+        while not stop.is_set():
+            action = self.rng.choices(actions, weights)[0]
+            started = time.perf_counter()
+            error = None
+            try:
+                result = getattr(self, action)()
+                # The advisor does not raise on upstream failures, it returns error or fallback texts
+                if isinstance(result, str) and is_failure_result(result):
+                    error = result
+            except Exception as e:
+                error = e
+            if error is not None:
+                logger.error(f"Load test session {self.user_id} failed in {action}: {error}")
+            record(action, time.perf_counter() - started, error is None)
+            if self.think_time:
+                stop.wait(self.rng.uniform(0, 2 * self.think_time))
+
+
+# Environment variables the API clients read their credentials from. The stubs accept any value.
+STUB_CREDENTIALS = ("OPENAI_API_KEY", "TECHSPECS_API_ID", "TECHSPECS_API_KEY")
+
+
+@contextmanager
+def _stub_credentials():
+    # Sets fake credentials only while the clients are created, so they do not leak into the rest of the process
+    added = [name for name in STUB_CREDENTIALS if name not in os.environ]
+    os.environ.update({name: "loadtest" for name in added})
+    try:
+        yield
+    finally:
+        for name in added:
+            os.environ.pop(name, None)
+
+
+def _stop_threads(stop: threading.Event, threads: list[threading.Thread]):
+    stop.set()
+    for thread in threads:
+        if thread.is_alive():
+            thread.join()
+
+
+def run_load_test(sessions: int = 10, duration: float = 30.0, think_time: float = 0.5,
+                  techspecs_latency: float = 0.05, llm_latency: float = 0.2,
+                  sample_interval: float = 1.0, trace_memory: bool = False, db_path: str = None,
+                  llm_error_rate: float = 0.0) -> dict:
+    """
+    Runs the load test and returns the report as a dict.
+    Actions that return an advisor error or fallback message count as errors.
+    """
+    # Everything started here is shut down again on any exit, including errors
+    with ExitStack() as cleanup:
+        stub = StubUpstreams(techspecs_latency=techspecs_latency, llm_latency=llm_latency, llm_error_rate=llm_error_rate).start()
+        cleanup.callback(stub.stop)
+        if db_path is None:
+            db_path = os.path.join(cleanup.enter_context(tempfile.TemporaryDirectory()), "loadtest.db")
+
+        # Shared like the st.cache_resource instances in frontend/app.py
+        with _stub_credentials():
+            llm_client = LLMClient(base_url=stub.llm_base_url)
+            electronics_api_client = ElectronicsAPIClient(base_url=stub.techspecs_base_url)
+        advisor = ElectronicsAdvisor(llm_client, electronics_api_client, prefetch_comparisons=True)
+        db_manager = DatabaseManager(db_path)
+        db_manager.connect()
+        cleanup.callback(db_manager.disconnect)
+
+        latencies = defaultdict(list)
+        errors = defaultdict(int)
+        results_lock = threading.Lock()
+
+        def record(action: str, latency: float, ok: bool):
+            with results_lock:
+                latencies[action].append(latency)
+                if not ok:
+                    errors[action] += 1
+
+        if trace_memory:
+            tracemalloc.start()
+            cleanup.callback(tracemalloc.stop)
+        memory_samples = []
+        stop = threading.Event()
+        started = time.perf_counter()
+
+        def sample_memory():
+            while True:
+                with results_lock:
+                    operations = sum(len(v) for v in latencies.values())
+                sample = {
+                    "elapsed_seconds": round(time.perf_counter() - started, 2),
+                    "rss_mb": round(_rss_mb(), 1),
+                    "operations": operations,
+                    "search_cache_entries": len(advisor.search_cache),
+                    "specs_cache_entries": len(advisor.specs_cache),
+                }
+                if trace_memory:
+                    sample["traced_mb"] = round(tracemalloc.get_traced_memory()[0] / 1024 / 1024, 1)
+                memory_samples.append(sample)
+                if stop.wait(sample_interval):
+                    return
+
+        sampler = threading.Thread(target=sample_memory, name="loadtest-memory", daemon=True)
+        threads = [
+            threading.Thread(target=Session(i, advisor, db_manager, stub, think_time, seed=i).run,
+                             args=(stop, record), name=f"loadtest-session-{i}", daemon=True)
+            for i in range(sessions)
+        ]
+        logger.info(f"Starting load test with {sessions} sessions for {duration}s.")
+        cleanup.callback(_stop_threads, stop, [sampler] + threads)
+        sampler.start()
+        for thread in threads:
+            thread.start()
+        time.sleep(duration)
+        _stop_threads(stop, threads)
+        elapsed = time.perf_counter() - started
+        _stop_threads(stop, [sampler])
+
+        operations = {}
+        for action, values in sorted(latencies.items()):
+            values_ms = np.array(values) * 1000
+            operations[action] = {
+                "count": len(values),
+                "errors": errors[action],
+                "throughput_per_second": round(len(values) / elapsed, 2),
+                "p50_ms": round(float(np.percentile(values_ms, 50)), 1),
+                "p95_ms": round(float(np.percentile(values_ms, 95)), 1),
+                "p99_ms": round(float(np.percentile(values_ms, 99)), 1),
+                "max_ms": round(float(values_ms.max()), 1),
+            }
+        total = sum(op["count"] for op in operations.values())
+        lock_stats = db_manager.get_lock_stats()
+
+        report = {
+            "sessions": sessions,
+            "duration_seconds": round(elapsed, 2),
+            "total_operations": total,
+            "total_errors": sum(errors.values()),
+            "throughput_per_second": round(total / elapsed, 2),
+            "operations": operations,
+            "db_lock": {
+                "acquisitions": lock_stats["acquisitions"],
+                "total_wait_ms": round(lock_stats["wait_seconds"] * 1000, 2),
+                "average_wait_ms": round(lock_stats["wait_seconds"] * 1000 / max(lock_stats["acquisitions"], 1), 3),
+                "max_wait_ms": round(lock_stats["max_wait_seconds"] * 1000, 2),
+            },
+            "memory": {
+                "start_rss_mb": memory_samples[0]["rss_mb"],
+                "end_rss_mb": memory_samples[-1]["rss_mb"],
+                "growth_mb": round(memory_samples[-1]["rss_mb"] - memory_samples[0]["rss_mb"], 1),
+                "samples": memory_samples,
+            },
+            "upstream_requests": dict(stub.request_counts),
+            "llm_usage": llm_client.get_usage_stats(),
+        }
+    return report
+
+
+def format_report(report: dict) -> str:
+    lines = [
+        f"Sessions: {report['sessions']}, duration: {report['duration_seconds']}s, "
+        f"operations: {report['total_operations']} ({report['throughput_per_second']}/s), errors: {report['total_errors']}",
+        "",
+        f"{'operation':<14}{'count':>7}{'errors':>8}{'ops/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}",
+    ]
+    for action, op in report["operations"].items():
+        lines.append(f"{action:<14}{op['count']:>7}{op['errors']:>8}{op['throughput_per_second']:>8}"
+                     f"{op['p50_ms']:>9}{op['p95_ms']:>9}{op['p99_ms']:>9}{op['max_ms']:>9}")
+    db_lock = report["db_lock"]
+    memory = report["memory"]
+    lines += [
+        "",
+        f"DB lock: {db_lock['acquisitions']} acquisitions, average wait {db_lock['average_wait_ms']} ms, "
+        f"max wait {db_lock['max_wait_ms']} ms",
+        f"Memory (RSS): {memory['start_rss_mb']} MB -> {memory['end_rss_mb']} MB ({memory['growth_mb']:+} MB)",
+        f"Upstream requests: {report['upstream_requests']}",
+    ]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate concurrent app sessions against local stub upstreams.")
+    parser.add_argument("--sessions", type=int, default=10, help="Number of concurrent sessions.")
+    parser.add_argument("--duration", type=float, default=30.0, help="Test duration in seconds.")
+    parser.add_argument("--think-time", type=float, default=0.5, help="Average pause between user actions in seconds.")
+    parser.add_argument("--techspecs-latency", type=float, default=0.05, help="Stub TechSpecs latency in seconds.")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Stub LLM latency in seconds.")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0, help="Share of stub LLM calls that fail with a 500 error.")
+    parser.add_argument("--sample-interval", type=float, default=1.0, help="Memory sampling interval in seconds.")
+    parser.add_argument("--trace-memory", action="store_true", help="Also report Python heap usage via tracemalloc.")
+    parser.add_argument("--json", action="store_true", help="Print the full report as JSON.")
+    args = parser.parse_args(argv)
+
+    report = run_load_test(
+        sessions=args.sessions,
+        duration=args.duration,
+        think_time=args.think_time,
+        techspecs_latency=args.techspecs_latency,
+        llm_latency=args.llm_latency,
+        llm_error_rate=args.llm_error_rate,
+        sample_interval=args.sample_interval,
+        trace_memory=args.trace_memory)
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    return 1 if report["total_errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
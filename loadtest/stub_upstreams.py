@@ -0,0 +1,150 @@
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from utils.logger import logger
+
+BRANDS = ("Samsung", "Apple", "Google", "Xiaomi", "Motorola")
+
+
+def _build_devices(count: int) -> dict:
+    rng = random.Random(42)
+    devices = {}
+    for index in range(count):
+        brand = BRANDS[index % len(BRANDS)]
+        device_id = f"stub_{index}"
+        devices[device_id] = {
+            "id": device_id,
+            "name": f"{brand} Stub Phone {index}",
+            "Product": {"Brand": brand, "Category": "Smartphones"},
+            "display": {"size": f"{rng.choice([5.8, 6.1, 6.4, 6.7, 6.9])}-inch", "resolution": "FHD+"},
+            "processor": f"StubChip {rng.randint(1, 9)}",
+            "ram": f"{rng.choice([4, 6, 8, 12, 16])} GB",
+            "storage": f"{rng.choice([64, 128, 256, 512])} GB",
+            "camera": {"main": f"{rng.choice([12, 48, 50, 108, 200])}MP", "selfie": "12MP"},
+            "battery": f"{rng.randint(30, 60) * 100} mAh",
+            "os": "iOS" if brand == "Apple" else "Android",
+            "weight": f"{rng.randint(150, 240)} g",
+        }
+    return devices
+
+
+class StubUpstreams:
+    """
+    Local HTTP server imitating the TechSpecs API (/v5/product/...) and the
+    OpenAI chat completions API (/v1/chat/completions), with configurable latencies.
+    llm_error_rate is the share of chat completions answered with a 500 error.
+    """
+
+    def __init__(self, techspecs_latency: float = 0.05, llm_latency: float = 0.2, device_count: int = 50,
+                 llm_error_rate: float = 0.0):
+        self.techspecs_latency = techspecs_latency
+        self.llm_latency = llm_latency
+        self.llm_error_rate = llm_error_rate
+        self._rng = random.Random(7)
+        self.devices = _build_devices(device_count)
+        self.device_ids = list(self.devices)
+        self.request_counts = {"search": 0, "specs": 0, "llm": 0}
+        self._counts_lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-upstreams", daemon=True)
+
+    @property
+    def techspecs_base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}/v5"
+
+    @property
+    def llm_base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}/v1"
+
+    def start(self) -> "StubUpstreams":
+        self._thread.start()
+        logger.info(f"Stub upstreams listening on 127.0.0.1:{self._server.server_port}")
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _count(self, kind: str):
+        with self._counts_lock:
+            self.request_counts[kind] += 1
+
+    def search(self, query: str, size: int) -> dict:
+        # Deterministic per query, so repeated searches return the same page
+        start = zlib.crc32(query.casefold().encode("utf-8")) % len(self.device_ids)
+        ids = [self.device_ids[(start + offset) % len(self.device_ids)] for offset in range(min(size, len(self.device_ids)))]
+        return {"products": [{"id": device_id, "name": self.devices[device_id]["name"]} for device_id in ids]}
+
+    def chat_completion(self, body: dict) -> dict:
+        prompt = body["messages"][-1]["content"]
+        if "Provide the output in a JSON format" in prompt:
+            # Echo the requirements as keywords, so different requirements lead to different searches
+            requirements = re.search(r'User requirements: "(.*)"', prompt)
+            keywords = requirements.group(1) if requirements else "great camera, long battery"
+            content = json.dumps({"category": "Smartphones", "brand": "any", "keywords": keywords})
+        else:
+            content = "Stub recommendation: the first listed device matches your priorities best."
+        prompt_tokens = sum(len(m["content"]) for m in body["messages"]) // 4
+        return {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": len(content) // 4,
+                "total_tokens": prompt_tokens + len(content) // 4,
+                # The stub does no prefix matching, so it reports no cached tokens rather than a made-up share
+                "prompt_tokens_details": {"cached_tokens": 0}
+            }
+        }
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, payload: dict, status: int = 200):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                params = parse_qs(url.query)
+                time.sleep(stub.techspecs_latency)
+                if url.path == "/v5/product/search":
+                    stub._count("search")
+                    self._send_json(stub.search(params.get("query", [""])[0], int(params.get("size", ["10"])[0])))
+                elif url.path.startswith("/v5/product/"):
+                    stub._count("specs")
+                    device = stub.devices.get(url.path.rsplit("/", 1)[-1])
+                    self._send_json(device if device else {"message": "Not found"}, 200 if device else 404)
+                else:
+                    self._send_json({"message": "Not found"}, 404)
+
+            def do_POST(self):
+                if urlparse(self.path).path != "/v1/chat/completions":
+                    self._send_json({"message": "Not found"}, 404)
+                    return
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                stub._count("llm")
+                time.sleep(stub.llm_latency)
+                if stub._rng.random() < stub.llm_error_rate:
+                    self._send_json({"error": {"message": "Stub upstream failure", "type": "server_error"}}, 500)
+                    return
+                self._send_json(stub.chat_completion(body))
+
+        return Handler
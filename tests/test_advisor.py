@@ -1,7 +1,9 @@
+import time
 import pytest
 from unittest.mock import MagicMock, patch
-from core.advisor import ElectronicsAdvisor
-from api_clients.llm_client import LLMClient
+from core.advisor import ElectronicsAdvisor, is_failure_result
+from utils.i18n import get_text
+from api_clients.llm_client import LLMClient, LLM_ERROR_MESSAGE
 from api_clients.electronics_api_client import ElectronicsAPIClient
 
 @pytest.fixture
@@ -75,6 +77,12 @@ def test_compare_devices_success(advisor, mock_llm_client, mock_electronics_api_
     device_names = ["Samsung S24 Ultra", "iPhone 15 Pro"]
     user_profile = "I prioritize camera quality and battery life."
 
+    # Each name resolves to its own device
+    mock_electronics_api_client.search_devices.side_effect = lambda query, **kwargs: (
+        [{"id": "samsung_s24", "name": "Samsung Galaxy S24 Ultra"}] if "Samsung" in query
+        else [{"id": "iphone_15", "name": "iPhone 15 Pro"}]
+    )
+
     # We mock LLM answer for comparison
     mock_llm_client.get_completion.return_value = "The Samsung S24 Ultra has a better camera and larger battery, while iPhone 15 Pro offers superior performance for gaming."
 
@@ -92,3 +100,101 @@ def test_get_personalized_recommendation_no_devices_found(advisor, mock_llm_clie
 
     recommendation = advisor.get_personalized_recommendation(user_req, lang="en")
     assert "No devices found matching your criteria" in recommendation
+
+def test_get_personalized_recommendations_batch_shares_lookups(advisor, mock_llm_client, mock_electronics_api_client):
+    def completion_side_effect(prompt, **kwargs):
+        if "Provide the output in a JSON format" in prompt:
+            return '{"category": "Smartphones", "brand": "any", "keywords": "great camera"}'
+        return "Recommended: Samsung Galaxy S24 Ultra"
+    mock_llm_client.get_completion.side_effect = completion_side_effect
+
+    batch = [
+        ("I want a great camera.", "en"),
+        ("Camera is what matters to me.", "en"),
+        ("I want a great camera.", "en"),
+    ]
+    results = dict(advisor.get_personalized_recommendations_batch(batch, max_workers=2))
+
+    assert sorted(results) == [0, 1, 2]
+    assert all("Samsung Galaxy S24 Ultra" in r for r in results.values())
+    assert mock_llm_client.get_completion.call_count == 4 # Duplicate pair is computed once
+    assert mock_electronics_api_client.search_devices.call_count == 1 # Same extracted search is shared
+    assert mock_electronics_api_client.get_device_specs.call_count == 2 # One fetch per device
+
+def test_get_personalized_recommendations_batch_cancels_when_abandoned(advisor):
+    started = []
+    def recommend(user_requirements, lang):
+        started.append(user_requirements)
+        time.sleep(0.01)
+        return f"Recommendation for {user_requirements}"
+    advisor.get_personalized_recommendation = recommend
+
+    batch = advisor.get_personalized_recommendations_batch([(f"Request {i}", "en") for i in range(20)], max_workers=1)
+    next(batch)
+    batch.close()
+
+    assert len(started) < 20 # Queued pipelines were cancelled instead of run
+
+def test_get_personalized_recommendation_falls_back_to_local_ranking(advisor, mock_llm_client):
+    mock_llm_client.get_completion.side_effect = [
+        '{"category": "Smartphones", "brand": "any", "keywords": "long battery"}',
+        LLM_ERROR_MESSAGE # LLM becomes unavailable for the final recommendation
+    ]
+
+    recommendation = advisor.get_personalized_recommendation("Long battery life please.", lang="en")
+
+    assert "Best match for your requirements: Samsung Galaxy S24 Ultra." in recommendation # 5000 mAh beats 4000 mAh
+    assert "Also worth considering: iPhone 15 Pro." in recommendation
+
+def test_recommendation_prefetches_comparison_candidates(mock_llm_client, mock_electronics_api_client):
+    advisor = ElectronicsAdvisor(mock_llm_client, mock_electronics_api_client, prefetch_comparisons=True)
+    mock_llm_client.get_completion.side_effect = [
+        '{"category": "Smartphones", "brand": "any", "keywords": "great camera"}',
+        "Samsung Galaxy S24 Ultra is the best fit, iPhone 15 Pro is also worth a look.",
+        "Comparison result"
+    ]
+
+    advisor.get_personalized_recommendation("Great camera please.", lang="en")
+    search_calls = mock_electronics_api_client.search_devices.call_count
+    spec_calls = mock_electronics_api_client.get_device_specs.call_count
+
+    comparison = advisor.compare_devices(["Samsung Galaxy S24 Ultra", "iphone 15 pro"], lang="en")
+
+    assert comparison == "Comparison result"
+    assert mock_electronics_api_client.search_devices.call_count == search_calls # Served from warmed caches
+    assert mock_electronics_api_client.get_device_specs.call_count == spec_calls
+    assert "Device Name: iPhone 15 Pro" in mock_llm_client.get_completion.call_args[0][0]
+
+def test_recommendation_does_not_refetch_failed_specs(mock_llm_client, mock_electronics_api_client):
+    advisor = ElectronicsAdvisor(mock_llm_client, mock_electronics_api_client, prefetch_comparisons=True)
+    mock_electronics_api_client.search_devices.return_value = [
+        {"id": "samsung_s24", "name": "Samsung Galaxy S24 Ultra"},
+        {"id": "missing", "name": "Missing Phone"} # Spec fetch fails (empty result)
+    ]
+
+    advisor.get_personalized_recommendation("Great camera please.", lang="en")
+
+    fetched_ids = [c.args[0] for c in mock_electronics_api_client.get_device_specs.call_args_list]
+    assert fetched_ids.count("missing") == 1 # No background retry of the failing product
+
+def test_fallback_lists_search_order_without_comparable_specs(advisor, mock_llm_client):
+    mock_llm_client.get_completion.side_effect = [
+        '{"category": "Smartphones", "brand": "any", "keywords": "lots of storage"}',
+        LLM_ERROR_MESSAGE
+    ]
+
+    recommendation = advisor.get_personalized_recommendation("Lots of storage please.", lang="en")
+
+    # Neither mocked device lists storage, so nothing was compared
+    assert recommendation.startswith(get_text("fallback_search_order", "en").split("{")[0])
+    assert "Samsung Galaxy S24 Ultra, iPhone 15 Pro" in recommendation
+    assert is_failure_result(recommendation)
+
+def test_is_failure_result_detects_errors_and_fallbacks(advisor, mock_llm_client):
+    assert is_failure_result(LLM_ERROR_MESSAGE)
+    assert is_failure_result(get_text("no_devices_found", "cs"))
+    assert is_failure_result(get_text("error_no_comparison_specs", "en"))
+
+    mock_llm_client.get_completion.side_effect = ['{"category": "all", "brand": "any", "keywords": "battery"}', LLM_ERROR_MESSAGE]
+    assert is_failure_result(advisor.get_personalized_recommendation("Long battery life please.", lang="cs"))
+    assert not is_failure_result("Samsung Galaxy S24 Ultra is the best match for you.")
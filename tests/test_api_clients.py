@@ -2,6 +2,7 @@ import pytest
 from unittest.mock import MagicMock, patch
 import os
 import requests
+import openai
 import urllib.parse
 
 @pytest.fixture(autouse=True)
@@ -13,7 +14,7 @@ def mock_env_vars():
     }):
         yield
 
-from api_clients.llm_client import LLMClient
+from api_clients.llm_client import LLMClient, LLM_ERROR_MESSAGE
 from utils.logger import logger
 from utils.i18n import get_text, TRANSLATIONS
 
@@ -47,6 +48,30 @@ def test_llm_get_completion_api_error(mock_openai):
     expected_error_message_from_llm_client = "Omlouváme se, došlo k chybě při zpracování vašeho požadavku."
     assert expected_error_message_from_llm_client in response
 
+@patch('api_clients.llm_client.OpenAI')
+def test_llm_get_completion_with_system_prompt_records_cached_tokens(mock_openai):
+    mock_instance = mock_openai.return_value
+    mock_instance.chat.completions.create.return_value = MagicMock(
+        choices=[MagicMock(message=MagicMock(content="Mocked AI response"))],
+        usage=MagicMock(prompt_tokens=2000, completion_tokens=100,
+                        prompt_tokens_details=MagicMock(cached_tokens=1536))
+    )
+
+    client = LLMClient(api_key_env_var="OPENAI_API_KEY")
+    client.get_completion("Instructions and payload", system_prompt="You are an advisor.")
+    mock_instance.chat.completions.create.assert_called_once_with(
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": "You are an advisor."},
+            {"role": "user", "content": "Instructions and payload"}
+        ]
+    )
+    stats = client.get_usage_stats()
+    assert stats["requests"] == 1
+    assert stats["prompt_tokens"] == 2000
+    assert stats["cached_tokens"] == 1536
+    assert stats["cached_token_ratio"] == 0.768
+
 
 from api_clients.electronics_api_client import ElectronicsAPIClient
 
@@ -137,7 +162,48 @@ def test_electronics_api_request_http_error(mock_get):
     mock_get.assert_called_once()
     mock_response.raise_for_status.assert_called_once()
 
+@patch('requests.get')
+def test_electronics_api_circuit_breaker_fails_fast_after_timeouts(mock_get):
+    mock_get.side_effect = requests.exceptions.Timeout("read timed out")
 
+    client = ElectronicsAPIClient()
+    for _ in range(client.circuit_breaker.failure_threshold):
+        assert client.get_device_specs("prod1") == {}
+    assert mock_get.call_count == client.circuit_breaker.failure_threshold
 
-    
+    assert client.search_devices("anything") == [] # Breaker is open, no request is sent
+    assert mock_get.call_count == client.circuit_breaker.failure_threshold
 
+@patch('api_clients.llm_client.OpenAI')
+def test_llm_circuit_breaker_fails_fast(mock_openai):
+    mock_instance = mock_openai.return_value
+    mock_instance.chat.completions.create.side_effect = openai.APITimeoutError(request=MagicMock())
+
+    client = LLMClient(api_key_env_var="OPENAI_API_KEY")
+    for _ in range(client.circuit_breaker.failure_threshold + 2):
+        assert client.get_completion("prompt") == LLM_ERROR_MESSAGE
+    assert mock_instance.chat.completions.create.call_count == client.circuit_breaker.failure_threshold
+
+@patch('api_clients.llm_client.OpenAI')
+def test_llm_client_errors_do_not_open_breaker(mock_openai):
+    mock_instance = mock_openai.return_value
+    mock_instance.chat.completions.create.side_effect = openai.BadRequestError(
+        "context length exceeded", response=MagicMock(status_code=400), body=None)
+
+    client = LLMClient(api_key_env_var="OPENAI_API_KEY")
+    for _ in range(client.circuit_breaker.failure_threshold + 2):
+        assert client.get_completion("prompt") == LLM_ERROR_MESSAGE
+    assert client.circuit_breaker.state == "closed"
+    assert mock_instance.chat.completions.create.call_count == client.circuit_breaker.failure_threshold + 2
+    assert mock_openai.call_args.kwargs["max_retries"] == 1 # One SDK retry with backoff before the breaker sees a failure
+
+@patch('api_clients.llm_client.OpenAI')
+def test_llm_rate_limit_errors_open_breaker(mock_openai):
+    mock_instance = mock_openai.return_value
+    mock_instance.chat.completions.create.side_effect = openai.RateLimitError(
+        "rate limit exceeded", response=MagicMock(status_code=429), body=None)
+
+    client = LLMClient(api_key_env_var="OPENAI_API_KEY")
+    for _ in range(client.circuit_breaker.failure_threshold):
+        client.get_completion("prompt")
+    assert client.circuit_breaker.state == "open"
@@ -0,0 +1,63 @@
+import numpy as np
+from data_manager.device_catalog import DeviceCatalog, DeviceRecord
+
+SPECS = [
+    {
+        "id": "samsung_s24",
+        "name": "Samsung Galaxy S24 Ultra",
+        "Product": {"Brand": "Samsung", "Category": "Smartphones"},
+        "camera": {"main": "200MP"},
+        "battery": "5000 mAh",
+        "os": "Android"
+    },
+    {
+        "id": "iphone_15",
+        "name": "iPhone 15 Pro",
+        "Product": {"Brand": "Apple", "Category": "Smartphones"},
+        "camera": {"main": "48MP"},
+        "battery": "3274 mAh",
+        "weight": "187 g",
+        "os": "iOS"
+    },
+    {
+        "id": "galaxy_tab",
+        "name": "Samsung Galaxy Tab S9 – černá",
+        "Product": {"Brand": "samsung", "Category": "Tablets"},
+        "battery": "8400 mAh",
+        "os": "Android"
+    },
+]
+
+def build_catalog():
+    return DeviceCatalog.from_records([DeviceRecord.from_specs(s, llm_text=f"Device Name: {s['name']}") for s in SPECS])
+
+def test_device_record_from_specs():
+    record = DeviceRecord.from_specs(SPECS[0])
+    assert record.brand == "Samsung"
+    assert record.category == "Smartphones"
+    assert record.os == "Android"
+    assert record.camera_mp == 200
+    assert np.isnan(record.weight_g)
+    assert not hasattr(record, "__dict__") # Slotted, no per-instance dict
+
+def test_device_catalog_filter_and_rank():
+    catalog = build_catalog()
+    assert len(catalog) == 3
+    assert catalog.vocabularies["os"] == ["Android", "iOS"] # Interned once per value
+    assert catalog.filter(brand="samsung").tolist() == [0, 2]
+    assert catalog.filter(brand="Samsung", category="Smartphones").tolist() == [0]
+    assert catalog.rank("long battery", top_k=1).tolist() == [2]
+    assert catalog.rank("great camera", top_k=1, rows=catalog.filter(category="Smartphones")).tolist() == [0]
+
+def test_device_catalog_save_and_load_memory_mapped(tmp_path):
+    build_catalog().save(str(tmp_path))
+    catalog = DeviceCatalog.load(str(tmp_path))
+
+    assert isinstance(catalog.features, np.memmap)
+    assert catalog.index_of("galaxy_tab") == 2
+    assert catalog.index_of("unknown") == -1
+    record = catalog.record(2)
+    assert record.name == "Samsung Galaxy Tab S9 – černá"
+    assert record.llm_text == "Device Name: Samsung Galaxy Tab S9 – černá"
+    assert record.battery_mah == 8400
+    assert catalog.column("battery_mah").tolist() == [5000, 3274, 8400]
@@ -0,0 +1,32 @@
+import os
+from loadtest.load_generator import run_load_test, format_report
+
+def test_load_test_runs_against_stub_upstreams(tmp_path):
+    report = run_load_test(sessions=3, duration=1.0, think_time=0.01, techspecs_latency=0.0, llm_latency=0.0,
+                           sample_interval=0.2, db_path=str(tmp_path / "loadtest.db"))
+
+    assert report["total_operations"] > 0
+    assert report["total_errors"] == 0
+    assert set(report["operations"]) <= {"load_profile", "save_profile", "recommend", "compare"}
+    assert report["db_lock"]["acquisitions"] > 0
+    assert len(report["memory"]["samples"]) >= 2
+    assert report["upstream_requests"]["llm"] > 0 # Requests really went through the clients
+    assert "DB lock:" in format_report(report)
+    assert report["llm_usage"]["cached_tokens"] == 0 # The stub does not simulate prompt caching
+
+def test_load_test_counts_upstream_failures_as_errors(tmp_path):
+    report = run_load_test(sessions=2, duration=0.5, think_time=0.01, techspecs_latency=0.0, llm_latency=0.0,
+                           sample_interval=0.2, db_path=str(tmp_path / "loadtest.db"), llm_error_rate=1.0)
+
+    assert report["total_errors"] > 0 # Fallback recommendations and failed comparisons are not successes
+    assert report["total_errors"] == sum(op["errors"] for op in report["operations"].values())
+
+def test_load_test_does_not_leak_fake_credentials(tmp_path, monkeypatch):
+    for name in ("OPENAI_API_KEY", "TECHSPECS_API_ID", "TECHSPECS_API_KEY"):
+        monkeypatch.delenv(name, raising=False)
+
+    run_load_test(sessions=1, duration=0.2, think_time=0.01, techspecs_latency=0.0, llm_latency=0.0,
+                  sample_interval=0.1, db_path=str(tmp_path / "loadtest.db"))
+
+    assert "OPENAI_API_KEY" not in os.environ
+    assert "TECHSPECS_API_ID" not in os.environ
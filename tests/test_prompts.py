@@ -0,0 +1,21 @@
+from core.prompts import get_prompt_template, SEARCH_PARAMS, RECOMMENDATION, COMPARISON
+
+def test_prompt_templates_are_compiled_once_per_language_and_model():
+    assert get_prompt_template(RECOMMENDATION, "cs") is get_prompt_template(RECOMMENDATION, "cs")
+    assert get_prompt_template(RECOMMENDATION, "cs") is not get_prompt_template(RECOMMENDATION, "en")
+    assert "in Czech." in get_prompt_template(RECOMMENDATION, "cs").text
+    assert "$language" not in get_prompt_template(COMPARISON, "en").text
+
+def test_prompt_template_render_keeps_user_text_verbatim():
+    prompt = get_prompt_template(SEARCH_PARAMS, "en").render(user_requirements="Phone under $500 with {braces}")
+    assert 'User requirements: "Phone under $500 with {braces}"' in prompt
+    assert '{"category": "category_name"' in prompt # JSON example needs no escaping
+    assert "Smartwatches" in prompt
+
+def test_prompts_start_with_a_stable_prefix():
+    template = get_prompt_template(COMPARISON, "en")
+    first = template.render(formatted_specs="Device Name: A", user_profile_summary="I like photos.")
+    second = template.render(formatted_specs="Device Name: B", user_profile_summary="Battery first.")
+    assert first.startswith(template.prefix) and second.startswith(template.prefix)
+    assert first.index("Device Name: A") < first.index("I like photos.") # User text comes last
+    assert template.system == get_prompt_template(SEARCH_PARAMS, "cs").system # Shared system message
@@ -0,0 +1,80 @@
+import numpy as np
+from core.ranking import FEATURE_NAMES, extract_features, keyword_weights, rank_rows
+
+CAMERA_PHONE = {
+    "id": "camera_phone",
+    "name": "Camera Phone",
+    "display": {"size": "6.8-inch"},
+    "camera": {"main": "200MP", "selfie": "12 MP"},
+    "battery": "4000 mAh",
+    "weight": "233 g"
+}
+BATTERY_PHONE = {
+    "id": "battery_phone",
+    "name": "Battery Phone",
+    "camera": {"main": "48MP"},
+    "battery": "6000 mAh",
+    "storage": "1 TB",
+    "weight": "187g"
+}
+
+LIGHT_LAPTOP = {
+    "id": "light_laptop",
+    "name": "Light Laptop",
+    "Product": {"Category": "Notebooks"},
+    "display": {"size": "13.3 inch"},
+    "battery": "52.6 Wh",
+    "storage": "512 GB",
+    "weight": "1.24 kg"
+}
+BIG_BATTERY_LAPTOP = {
+    "id": "big_battery_laptop",
+    "name": "Big Battery Laptop",
+    "Product": {"Category": "Notebooks"},
+    "display": {"size": "16 inch"},
+    "battery": "99.9 Wh",
+    "storage": "1 TB",
+    "weight": "2150 grams"
+}
+
+def test_extract_features_parses_units():
+    features = dict(zip(FEATURE_NAMES, extract_features(CAMERA_PHONE)))
+    assert features["camera_mp"] == 200 # Main camera, not selfie
+    assert features["battery_mah"] == 4000
+    assert features["display_in"] == 6.8
+    assert features["weight_g"] == 233
+    assert np.isnan(features["ram_gb"])
+    assert dict(zip(FEATURE_NAMES, extract_features(BATTERY_PHONE)))["storage_gb"] == 1024
+
+def test_extract_features_keeps_storage_out_of_ram():
+    features = dict(zip(FEATURE_NAMES, extract_features({"memory": {"ram": "8 GB", "internal": "256 GB"}})))
+    assert features["ram_gb"] == 8
+    assert features["storage_gb"] == 256
+
+def test_keyword_weights_match_whole_words():
+    assert keyword_weights("lots of RAM, 16GB memory")[FEATURE_NAMES.index("ram_gb")] > 0
+    assert keyword_weights("lots of RAM").tolist().count(0.0) == len(FEATURE_NAMES) - 1
+    assert keyword_weights("flashlight, breakfast").tolist() == [1.0] * len(FEATURE_NAMES) # No stem at a word start
+    czech = keyword_weights("dlouhá výdrž baterie, dobrý fotoaparát")
+    assert czech[FEATURE_NAMES.index("battery_mah")] > 0 and czech[FEATURE_NAMES.index("camera_mp")] > 0
+
+def test_keyword_weights_defaults_to_equal_weights():
+    assert keyword_weights("something unrelated").tolist() == [1.0] * len(FEATURE_NAMES)
+    assert keyword_weights("great camera")[FEATURE_NAMES.index("camera_mp")] > 0
+
+def test_rank_rows_orders_by_keywords():
+    candidates = [CAMERA_PHONE, BATTERY_PHONE, {"id": "unknown", "name": "Unknown"}]
+    features = np.vstack([extract_features(specs) for specs in candidates])
+    assert rank_rows(features, "great camera", top_k=2).tolist() == [0, 1]
+    assert rank_rows(features, "long battery life, lightweight", top_k=1).tolist() == [1]
+
+def test_extract_features_converts_laptop_units():
+    light = dict(zip(FEATURE_NAMES, extract_features(LIGHT_LAPTOP)))
+    assert light["weight_g"] == 1240
+    assert round(light["battery_mah"]) == 13662 # 52.6 Wh at a nominal 3.85 V
+    assert dict(zip(FEATURE_NAMES, extract_features(BIG_BATTERY_LAPTOP)))["weight_g"] == 2150
+
+def test_rank_rows_orders_laptops():
+    features = np.vstack([extract_features(specs) for specs in (LIGHT_LAPTOP, BIG_BATTERY_LAPTOP)])
+    assert rank_rows(features, "long battery laptop", top_k=1).tolist() == [1]
+    assert rank_rows(features, "lightweight laptop", top_k=1).tolist() == [0]
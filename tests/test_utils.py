@@ -14,4 +14,139 @@ def test_get_text_non_existent_key():
     assert get_text("non_existent_key", "cs") == "non_existent_key"
 
 def test_get_text_unsupported_language_falls_back_to_english():
-    assert get_text("welcome_title", "fr") == "AI Personal Shopper & Electronics Advisor" # It should fall into English
\ No newline at end of file
+    assert get_text("welcome_title", "fr") == "AI Personal Shopper & Electronics Advisor" # It should fall into English
+from utils.cache import LookupCache
+
+def test_lookup_cache_computes_once_and_skips_empty_results():
+    cache = LookupCache(maxsize=2)
+    calls = []
+    assert cache.get_or_compute("a", lambda: calls.append("a") or {"id": "a"}) == {"id": "a"}
+    assert cache.get_or_compute("a", lambda: calls.append("a") or {"id": "a"}) == {"id": "a"}
+    assert cache.get_or_compute("empty", lambda: calls.append("empty") or {}) == {}
+    assert "empty" not in cache # Failed/empty lookups are retried next time
+    assert calls == ["a", "empty"]
+
+def test_lookup_cache_expires_entries():
+    now = [0.0]
+    cache = LookupCache(ttl=10, clock=lambda: now[0])
+    calls = []
+    cache.get_or_compute("a", lambda: calls.append("a") or {"id": "a"})
+    now[0] = 9.0
+    assert "a" in cache
+    now[0] = 10.0
+    assert cache.get("a") is None # Expired entries are dropped
+    cache.get_or_compute("a", lambda: calls.append("a") or {"id": "a"})
+    assert calls == ["a", "a"]
+
+import os
+import re
+from utils.i18n import get_catalog, _compile_catalogs
+
+def test_catalogs_are_frozen_and_complete():
+    catalog = get_catalog("cs")
+    assert catalog["welcome_title"] == "AI Osobní Nákupčí a Elektronický Poradce"
+    assert get_catalog("fr") is get_catalog("en")
+    with pytest.raises(TypeError):
+        catalog["welcome_title"] = "changed"
+    with pytest.raises(ValueError):
+        _compile_catalogs({"en": {"a": "A", "b": "B"}, "cs": {"a": "A"}})
+
+def test_frontend_uses_only_existing_keys():
+    app_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "frontend", "app.py")
+    with open(app_path, encoding="utf-8") as f:
+        source = f.read()
+    used_keys = set(re.findall(r'texts\["(\w+)"\]', source)) | set(re.findall(r'get_text\("(\w+)"', source))
+    assert used_keys
+    assert used_keys <= set(TRANSLATIONS["en"])
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from utils.resilience import CircuitBreaker, HedgeBudget, LatencyTracker, hedged_call
+
+def test_circuit_breaker_opens_and_recovers():
+    now = [0.0]
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=10, clock=lambda: now[0])
+    breaker.record_failure()
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request() # Fails fast while open
+
+    now[0] = 11.0
+    assert breaker.allow_request() # Single half-open trial
+    assert not breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_latency_tracker_percentile():
+    tracker = LatencyTracker()
+    for latency in range(1, 101):
+        tracker.record(latency / 100)
+    assert tracker.percentile(95) == 0.95
+
+def test_hedged_call_returns_faster_duplicate():
+    release_first = threading.Event()
+    calls = []
+
+    def call():
+        calls.append(len(calls))
+        if len(calls) == 1:
+            release_first.wait(timeout=5) # First attempt hangs
+            return "slow"
+        return "fast"
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assert hedged_call(call, delay=0.01, executor=executor) == "fast"
+        release_first.set()
+    assert len(calls) == 2
+
+def test_hedge_budget_caps_duplicates():
+    budget = HedgeBudget(ratio=0.05)
+    hedges = 0
+    for _ in range(200):
+        budget.record_call()
+        hedges += budget.try_acquire()
+    assert hedges == 10 # At most about 5% extra requests
+
+def test_hedged_call_respects_budget():
+    calls = []
+
+    def call():
+        calls.append(len(calls))
+        time.sleep(0.05)
+        return "slow"
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assert hedged_call(call, delay=0.01, executor=executor, budget=HedgeBudget()) == "slow"
+    assert len(calls) == 1 # Empty budget, no duplicate
+
+def test_hedged_call_ignores_queue_time():
+    calls = []
+
+    def call():
+        calls.append(len(calls))
+        return "done"
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        executor.submit(time.sleep, 0.1) # Keeps the only worker busy well past the delay
+        assert hedged_call(call, delay=0.02, executor=executor) == "done"
+    assert len(calls) == 1
+
+def test_hedged_call_runs_inline_without_idle_workers():
+    threads = []
+
+    def call():
+        threads.append(threading.current_thread())
+        time.sleep(0.05)
+        return "done"
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        slots = threading.Semaphore(1)
+        assert hedged_call(call, delay=0.01, executor=executor, slots=slots) == "done" # No slot left for a duplicate
+        assert len(threads) == 1 and threads[0] is not threading.current_thread()
+
+        slots.acquire() # Pool is busy
+        assert hedged_call(call, delay=0.01, executor=executor, slots=slots) == "done"
+        assert threads[-1] is threading.current_thread() # Ran inline, without queueing or hedging
+        assert len(threads) == 2
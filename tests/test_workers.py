@@ -0,0 +1,40 @@
+import pytest
+from core.workers import CPUWorkerPool
+from data_manager.device_catalog import DeviceCatalog, normalize_specs
+
+BRANDS = ["Samsung", "Apple", "Google"]
+SPECS = [
+    {
+        "id": f"device_{i}",
+        "name": f"{BRANDS[i % 3]} Phone {i}",
+        "Product": {"Brand": BRANDS[i % 3], "Category": "Smartphones"},
+        "camera": {"main": f"{12 + (i * 7) % 100}MP"},
+        "battery": f"{3000 + (i * 137) % 3000} mAh",
+        "weight": f"{150 + (i * 11) % 90} g"
+    }
+    for i in range(40)
+]
+
+@pytest.fixture(scope="module")
+def cpu_pool():
+    # Worker processes are spawned, so share one pool across the tests
+    catalog = DeviceCatalog.from_records([normalize_specs(s) for s in SPECS])
+    pool = CPUWorkerPool(catalog=catalog, max_workers=2)
+    yield pool
+    pool.shutdown()
+
+def test_normalize_specs_in_workers_matches_local(cpu_pool):
+    records = cpu_pool.normalize_specs(SPECS, chunk_size=8)
+    assert [r.id for r in records] == [s["id"] for s in SPECS]
+    assert repr(records[5]) == repr(normalize_specs(SPECS[5])) # Missing features are NaN, which never compare equal
+    assert records[5].llm_text.startswith("Device Name: Google Phone 5")
+
+@pytest.mark.parametrize("keywords, filters", [
+    ("great camera", {}),
+    ("long battery, lightweight", {"brand": "samsung"}),
+    ("something unrelated", {"brand": "Apple"}),
+])
+def test_rank_catalog_in_workers_matches_local_ranking(cpu_pool, keywords, filters):
+    rows = cpu_pool.catalog.filter(**filters)
+    expected = cpu_pool.catalog.rank(keywords, top_k=5, rows=rows)
+    assert cpu_pool.rank_catalog(keywords, top_k=5, **filters).tolist() == expected.tolist()
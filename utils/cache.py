@@ -0,0 +1,91 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+
+class LookupCache:
+    """
+    Thread-safe LRU cache for upstream lookups (searches, device specs).
+    Concurrent callers asking for the same key share one in-flight call,
+    so a batch never fetches the same thing twice.
+    With ttl set, entries expire ttl seconds after they were stored.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = None, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._values = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def _lookup(self, key):
+        # Caller holds the lock. Returns (found, value) and drops the entry if it has expired.
+        entry = self._values.get(key)
+        if entry is None:
+            return False, None
+        value, expires_at = entry
+        if expires_at is not None and self._clock() >= expires_at:
+            del self._values[key]
+            return False, None
+        self._values.move_to_end(key)
+        return True, value
+
+    def get(self, key, default=None):
+        with self._lock:
+            found, value = self._lookup(key)
+            return value if found else default
+
+    def set(self, key, value):
+        with self._lock:
+            self._store(key, value)
+
+    def _store(self, key, value):
+        expires_at = self._clock() + self.ttl if self.ttl is not None else None
+        self._values[key] = (value, expires_at)
+        self._values.move_to_end(key)
+        while len(self._values) > self.maxsize:
+            self._values.popitem(last=False)
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            return self._lookup(key)[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._values)
+
+    def get_or_compute(self, key, compute):
+        """
+        Returns the cached value for key, or calls compute() once and caches the result.
+        Empty results ([] / {} / None) are returned but not cached, so failed
+        upstream calls are retried next time.
+        """
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                return value
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+
+        if not owner:
+            return future.result()
+
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._in_flight.pop(key, None)
+            if value:
+                self._store(key, value)
+        future.set_result(value)
+        return value
@@ -1,3 +1,7 @@
+from types import MappingProxyType
+
+DEFAULT_LANG = "en"
+
 TRANSLATIONS = {
     "en": {
         "welcome_title": "AI Personal Shopper & Electronics Advisor",
@@ -6,6 +10,7 @@ TRANSLATIONS = {
         "en_lang": "English",
         "enter_requirements": "Enter your requirements (e.g., 'I need a phone with a great camera for travel and long battery life'):",
         "get_recommendation": "Get Recommendation",
+        "get_recommendation_button": "Recommend",
         "recommendation_for_you": "Recommendation for you:",
         "compare_devices": "Compare Devices",
         "enter_device_names": "Enter device names to compare (comma-separated, e.g., 'iPhone 15 Pro, Samsung Galaxy S24 Ultra'):",
@@ -30,7 +35,10 @@ TRANSLATIONS = {
         "load_profile": "Load Profile",
         "no_user_id_warning": "Please enter a User ID to save/load your profile.",
         "enter_requirements_warning": "Please enter your requirements.",
-        "enter_device_names_warning": "Please enter device names to compare."
+        "enter_device_names_warning": "Please enter device names to compare.",
+        "fallback_recommendation": "The AI advisor is temporarily unavailable, so this pick is based on a direct comparison of specifications. Best match for your requirements: {best}.",
+        "fallback_alternatives": "Also worth considering: {others}.",
+        "fallback_search_order": "The AI advisor is temporarily unavailable and the available specifications do not cover your priorities, so these devices are listed in search order: {devices}."
     },
     "cs": {
         "welcome_title": "AI Osobní Nákupčí a Elektronický Poradce",
@@ -39,6 +47,7 @@ TRANSLATIONS = {
         "en_lang": "English",
         "enter_requirements": "Zadejte své požadavky (např. 'Potřebuji telefon s parádním foťákem na cestování a dlouhou výdrží baterie'):",
         "get_recommendation": "Získat doporučení",
+        "get_recommendation_button": "Doporučit",
         "recommendation_for_you": "Doporučení pro vás:",
         "compare_devices": "Porovnat zařízení",
         "enter_device_names": "Zadejte názvy zařízení k porovnání (oddělené čárkami, např. 'iPhone 15 Pro, Samsung Galaxy S24 Ultra'):",
@@ -63,14 +72,44 @@ TRANSLATIONS = {
         "load_profile": "Načíst profil",
         "no_user_id_warning": "Zadejte prosím uživatelské ID pro uložení/načtení profilu.",
         "enter_requirements_warning": "Zadejte prosím vaše požadavky.",
-        "enter_device_names_warning": "Zadejte prosím názvy zařízení k porovnání."
+        "enter_device_names_warning": "Zadejte prosím názvy zařízení k porovnání.",
+        "fallback_recommendation": "AI poradce je dočasně nedostupný, proto je tento výběr založen na přímém porovnání specifikací. Nejlepší shoda pro vaše požadavky: {best}.",
+        "fallback_alternatives": "Dále stojí za zvážení: {others}.",
+        "fallback_search_order": "AI poradce je dočasně nedostupný a dostupné specifikace nepokrývají vaše priority, proto jsou tato zařízení uvedena v pořadí vyhledávání: {devices}."
     }
 }
 
-def get_text(key: str, lang: str = "en") -> str:
+
+def _compile_catalogs(translations: dict) -> MappingProxyType:
+    """
+    Zmrazí překlady do neměnných katalogů pro každý jazyk.
+    Všechny jazyky musí mít stejnou sadu klíčů jako angličtina, jinak vyhodí ValueError.
+    """
+    reference_keys = set(translations[DEFAULT_LANG])
+    for lang, texts in translations.items():
+        missing = reference_keys - set(texts)
+        extra = set(texts) - reference_keys
+        if missing or extra:
+            raise ValueError(f"Translations for '{lang}' do not match '{DEFAULT_LANG}': "
+                             f"missing {sorted(missing)}, extra {sorted(extra)}")
+    return MappingProxyType({lang: MappingProxyType(dict(texts)) for lang, texts in translations.items()})
+
+
+CATALOGS = _compile_catalogs(TRANSLATIONS)
+
+
+def get_catalog(lang: str = DEFAULT_LANG) -> MappingProxyType:
+    """
+    Vrátí zmrazený katalog textů pro daný jazyk (nebo angličtinu).
+    Indexování katalogu chybějícím klíčem vyhodí KeyError místo tichého návratu klíče.
+    """
+    return CATALOGS.get(lang) or CATALOGS[DEFAULT_LANG]
+
+
+def get_text(key: str, lang: str = DEFAULT_LANG) -> str:
     """
     Vrátí lokalizovaný text pro daný klíč a jazyk.
     Pokud klíč nebo jazyk neexistuje, vrátí klíč samotný nebo anglickou verzi.
     """
     # Zkusí vrátit text pro zadaný jazyk, jinak se vrátí k angličtině
-    return TRANSLATIONS.get(lang, TRANSLATIONS["en"]).get(key, key)
\ No newline at end of file
+    return get_catalog(lang).get(key, key)
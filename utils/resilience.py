@@ -0,0 +1,161 @@
+import time
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, wait
+from utils.logger import logger
+
+
+class CircuitBreaker:
+    """
+    Per-upstream circuit breaker.
+    Opens after failure_threshold consecutive failures, rejects calls while open and,
+    after reset_timeout seconds, lets a single trial call through (half-open).
+    The trial call's outcome closes the breaker again or re-opens it.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0, clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                self._state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self._state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info(f"Circuit breaker '{self.name}' closed again.")
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning(f"Circuit breaker '{self.name}' opened after {self._failures} failures.")
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+
+
+class LatencyTracker:
+    """Keeps the most recent call latencies (in seconds) and reports percentiles over them."""
+
+    def __init__(self, window: int = 200):
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency: float):
+        with self._lock:
+            self._latencies.append(latency)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._latencies)
+
+    def percentile(self, percent: float) -> float:
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if not latencies:
+            return 0.0
+        index = min(len(latencies) - 1, int(round(percent / 100 * (len(latencies) - 1))))
+        return latencies[index]
+
+
+class HedgeBudget:
+    """
+    Token bucket limiting hedged duplicates to a fraction of calls.
+    Every call earns ratio tokens (up to max_tokens) and every hedge spends one,
+    so over time at most about ratio * calls extra requests are sent.
+    """
+
+    def __init__(self, ratio: float = 0.05, max_tokens: float = 10.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = 0.0
+        self._lock = threading.Lock()
+
+    def record_call(self):
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            return True
+
+
+def hedged_call(call, delay: float, executor: Executor, budget: HedgeBudget = None, slots: threading.Semaphore = None):
+    """
+    Runs call() on the executor and, if it is still running delay seconds after it started,
+    starts a duplicate (only if the budget allows one). Time spent queued in the executor does not
+    count towards the delay, so a busy executor does not trigger hedging on its own.
+    slots, when given, holds one permit per executor worker: without a free permit the call runs
+    inline on the caller's thread and no duplicate is sent, so calls never queue in the executor.
+    Returns the result of whichever finishes first successfully; raises only if both fail.
+    Only use for idempotent calls.
+    """
+    def submit(fn):
+        future = executor.submit(fn)
+        if slots is not None:
+            future.add_done_callback(lambda _: slots.release())
+        return future
+
+    if slots is not None and not slots.acquire(blocking=False):
+        return call()
+
+    started = threading.Event()
+
+    def first_attempt():
+        started.set()
+        return call()
+
+    first = submit(first_attempt)
+    started.wait()
+    done, _ = wait([first], timeout=delay)
+    if done:
+        return first.result()
+    if slots is not None and not slots.acquire(blocking=False):
+        return first.result()
+    if budget is not None and not budget.try_acquire():
+        if slots is not None:
+            slots.release()
+        return first.result()
+
+    logger.info(f"Call still running after {delay:.2f}s, sending a hedged duplicate.")
+    pending = {first, submit(call)}
+    error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+            error = future.exception()
+    raise error